@@ -5,10 +5,21 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 
 from .api import KlipschAPI
-from .const import CONF_SCAN_INTERVAL, DOMAIN, SCAN_INTERVAL_SECONDS
+from .const import (
+    CONF_FLEET_MAX_CONCURRENT,
+    CONF_SCAN_INTERVAL,
+    DOMAIN,
+    FLEET_KEY,
+    FLEET_MAX_CONCURRENT,
+    SCAN_INTERVAL_SECONDS,
+    STORAGE_VERSION,
+)
 from .coordinator import KlipschCoordinator
+from .fleet import FleetScheduler
 
 PLATFORMS = [Platform.MEDIA_PLAYER, Platform.SELECT, Platform.NUMBER, Platform.SENSOR]
 
@@ -17,14 +28,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Klipsch Flexus from a config entry."""
     host = entry.data[CONF_HOST]
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, SCAN_INTERVAL_SECONDS)
-    api = KlipschAPI(host)
-    coordinator = KlipschCoordinator(hass, api, host, scan_interval)
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    fleet: FleetScheduler = domain_data.setdefault(FLEET_KEY, FleetScheduler())
+    # Registered before the first request so the entry's fleet limit applies to it
+    phase = fleet.register(
+        entry.entry_id, scan_interval, entry.options.get(CONF_FLEET_MAX_CONCURRENT, FLEET_MAX_CONCURRENT)
+    )
+    api = KlipschAPI(host, session=async_get_clientsession(hass), fleet=fleet)
+    store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+    coordinator = KlipschCoordinator(hass, api, host, scan_interval, store)
 
-    await coordinator.async_config_entry_first_refresh()
+    # Entities start from the stored snapshot if there is one; otherwise
+    # setup waits for the first stage of the refresh only
+    try:
+        if not await coordinator.async_restore():
+            await coordinator.async_staged_first_refresh()
+    except Exception:
+        fleet.unregister(entry.entry_id)
+        raise
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    domain_data[entry.entry_id] = coordinator
+    coordinator.async_start_push(entry)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Live data follows in the background at once; the regular polls are
+    # offset by the phase so the bars don't poll in step
+    coordinator.async_start_deferred_load(entry, phase)
 
     entry.async_on_unload(entry.add_update_listener(_async_options_updated))
     return True
@@ -39,6 +68,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        coordinator: KlipschCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        domain_data = hass.data[DOMAIN]
+        coordinator: KlipschCoordinator = domain_data.pop(entry.entry_id)
+        await coordinator.async_shutdown()
         await coordinator.api.close()
+        domain_data[FLEET_KEY].unregister(entry.entry_id)
+        if domain_data.keys() == {FLEET_KEY}:
+            domain_data.pop(FLEET_KEY)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored state snapshot of a removed entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
@@ -3,287 +3,801 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import heapq
+import itertools
 import json
 import logging
+import random
 import time
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
+from typing import Any
 from urllib.parse import quote
 
 import aiohttp
 
 from .const import (
+    API_CONNECTIONS_PER_HOST,
+    API_DNS_CACHE_TTL,
+    API_KEEPALIVE_TIMEOUT,
+    API_PATHS,
     API_RETRIES,
     API_RETRY_DELAY,
     API_TIMEOUT_POWER,
     API_TIMEOUT_READ,
     API_TIMEOUT_WRITE,
-    NIGHT_MODE_FROM_API,
-    NIGHT_MODE_TO_API,
+    BATCH_READ_MAX_FAILURES,
+    BATCH_READ_ROOTS,
+    BREAKER_BACKOFF_BASE,
+    BREAKER_BACKOFF_MAX,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_JITTER,
+    EVENT_POLL_TIMEOUT,
+    POLL_TIME_BUDGET,
+    PROFILE_WRITE_ORDER,
 )
+from .fleet import FleetScheduler
+from .metrics import LatencyTracker, RequestMetrics
+from .schema import PARAMS, PARAMS_BY_PATH, Param, path_query
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class EventsNotSupportedError(Exception):
+    """The firmware has no event queue (modifyQueue rejected)."""
+
+
+class DeviceUnavailableError(Exception):
+    """The circuit breaker is open — the request was not sent."""
+
+
+class _WriteSuperseded(Exception):
+    """A newer value for the path was queued or sent while a write waited to retry."""
+
+
+# Request priorities (lower runs first)
+PRIORITY_COMMAND = 0  # user commands: set_*, media_control, set_power
+PRIORITY_POLL = 1  # background status/player reads
+
+
+class RequestScheduler:
+    """Single request slot granted by priority, FIFO within a priority.
+
+    Replaces a plain asyncio.Lock: when the slot frees up, a waiting command
+    goes before any queued poll read, however long the poll queue is.
+    """
+
+    def __init__(self) -> None:
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_POLL) -> AsyncIterator[None]:
+        if self._busy:
+            fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    self._release()  # slot was handed to us just before cancellation
+                raise
+        else:
+            self._busy = True
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """Hand the slot to the best live waiter, or mark it free."""
+        while self._waiters:
+            *_, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._busy = False
+
+
+class CircuitBreaker:
+    """Per-device circuit breaker: closed → open → half_open → closed.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failed requests the breaker
+    opens and requests fail instantly with DeviceUnavailableError. Once the
+    backoff has elapsed, one request is let through as a probe (half_open):
+    success closes the breaker, failure reopens it with a doubled backoff.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+        self._trips = 0  # consecutive openings, drives the backoff
+        self._retry_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next recovery probe (0 unless open)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def before_request(self) -> None:
+        """Raise DeviceUnavailableError unless a request may be sent now."""
+        if self.state == self.CLOSED:
+            return
+        if self.state == self.OPEN:
+            if time.monotonic() < self._retry_at:
+                raise DeviceUnavailableError(f"Device unreachable, next probe in {self.retry_in:.0f} s")
+            self.state = self.HALF_OPEN
+        if self._probing:
+            raise DeviceUnavailableError("Device unreachable, recovery probe in progress")
+        self._probing = True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            _LOGGER.debug("Device reachable again, closing circuit breaker")
+        self.state = self.CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= BREAKER_FAILURE_THRESHOLD:
+            self._trip()
+
+    def release(self) -> None:
+        """Forget an unfinished probe (request cancelled)."""
+        self._probing = False
+
+    def _trip(self) -> None:
+        self._trips += 1
+        backoff = min(BREAKER_BACKOFF_BASE * 2 ** (self._trips - 1), BREAKER_BACKOFF_MAX)
+        backoff *= random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+        self._retry_at = time.monotonic() + backoff
+        self.state = self.OPEN
+        _LOGGER.debug("Device unreachable, circuit breaker open for %.0f s", backoff)
+
+
+class _PollBudget:
+    """Wall-clock budget for the parameter reads of one poll.
+
+    At least one read is always let through, so a poll resumed at the cursor
+    makes progress however slow the device is.
+    """
+
+    def __init__(self, seconds: float | None) -> None:
+        self._deadline = None if seconds is None else time.monotonic() + seconds
+        self.sent = 0
+
+    def exhausted(self) -> bool:
+        return self._deadline is not None and self.sent > 0 and time.monotonic() >= self._deadline
+
+
 class KlipschAPI:
     """Client for Klipsch Flexus native HTTP API.
 
-    The soundbar is single-threaded — all requests are serialized via asyncio.Lock
-    to prevent collisions between polling and commands.
+    The soundbar is single-threaded — every request holds the scheduler slot, so
+    polling and commands never collide. Commands take priority over poll reads,
+    and a poll gives up the slot between parameters. The Cast server (port 8008)
+    is a separate service with its own slot and metrics, so its requests run
+    alongside port-80 ones.
     """
 
-    def __init__(self, host: str, port: int = 80, session: aiohttp.ClientSession | None = None) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int = 80,
+        session: aiohttp.ClientSession | None = None,
+        cast_port: int = 8008,
+        fleet: FleetScheduler | None = None,
+    ) -> None:
         self._host = host
         self._port = port
         self._base = f"http://{host}:{port}"
+        self._cast_base = f"http://{host}:{cast_port}"
         self._session = session
         self._own_session = session is None
-        self._lock = asyncio.Lock()
+        self._scheduler = RequestScheduler()
+        self._cast_scheduler = RequestScheduler()  # Cast server, port 8008
+        self.fleet = fleet  # shared with the other soundbars, if any
+        self.latency = LatencyTracker()
+        self.metrics = RequestMetrics()
+        self.cast_metrics = RequestMetrics()
+        self.breaker = CircuitBreaker()
         self._last_status: dict = {}
+        self._batch_unsupported: set[str] = set()  # getRows roots the firmware can't serve
+        self._batch_failures: dict[str, int] = {}  # getRows root → failed requests in a row
+        self._poll_cursor: str | None = None  # first key a budgeted poll left unread
+        # Write coalescing: latest queued value per path, and the tasks sending them
+        self._pending_writes: dict[str, tuple[dict, float | None, asyncio.Future[str]]] = {}
+        self._path_write_seq: dict[str, int] = {}  # value writes requested per path
+        self._write_tasks: set[asyncio.Task] = set()
+        self._affected: set[str] = set()  # status keys changed by writes, not yet re-read
         self.last_response_time: float | None = None  # ms
         self.total_requests: int = 0
         self.failed_requests: int = 0
 
+    def _fleet_slot(self) -> contextlib.AbstractAsyncContextManager[None]:
+        """Fleet-wide request slot (no limit for a standalone client)."""
+        return self.fleet.slot() if self.fleet is not None else contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def _measure(self, operation: str, path: str, metrics: RequestMetrics | None = None) -> Iterator[None]:
+        """Count one HTTP request and record its latency or failure.
+
+        Requests to another service pass its metrics; only port-80 requests
+        (the default) update the request counters and last response time.
+        """
+        own = metrics is None
+        metrics = self.metrics if metrics is None else metrics
+        t0 = time.monotonic()
+        if own:
+            self.total_requests += 1
+        try:
+            yield
+        except TimeoutError:
+            if own:
+                self.failed_requests += 1
+            metrics.timeout(operation, path)
+            raise
+        except Exception:
+            if own:
+                self.failed_requests += 1
+            metrics.error(operation, path)
+            raise
+        elapsed = time.monotonic() - t0
+        if own:
+            self.last_response_time = round(elapsed * 1000, 1)
+        metrics.observe(operation, path, elapsed)
+
     async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the injected session, or a private keep-alive pool for this host."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit_per_host=API_CONNECTIONS_PER_HOST,
+                keepalive_timeout=API_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=API_DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
             self._own_session = True
         return self._session
 
     async def close(self) -> None:
+        for task in self._write_tasks:
+            task.cancel()
         if self._own_session and self._session and not self._session.closed:
             await self._session.close()
 
     async def _request_with_retry(
         self,
         request_func,
+        key: str | None = None,
+        timeout: float | None = None,
+        ceiling: float = API_TIMEOUT_READ,
+        priority: int = PRIORITY_POLL,
         retries: int = API_RETRIES,
         delay: float = API_RETRY_DELAY,
     ):
-        """Execute HTTP request with retry on transient errors."""
-        for attempt in range(retries + 1):
+        """Execute HTTP request with retry on transient errors.
+
+        request_func is called with the attempt's timeout. An explicit timeout is
+        used as is; otherwise it is learned per key from recent response times
+        (see LatencyTracker), with ceiling as the cold-start value and upper bound.
+
+        Each attempt takes the scheduler slot on its own; the retry delay is
+        spent outside it so other requests can use the device meanwhile.
+        The device silently drops idle keep-alive sockets: the first
+        ServerDisconnectedError is retried at once and doesn't use up a retry.
+
+        Raises DeviceUnavailableError without touching the network while the
+        circuit breaker is open.
+        """
+        self.breaker.before_request()
+        try:
+            result = await self._attempts(request_func, key, timeout, ceiling, priority, retries, delay)
+        except (TimeoutError, aiohttp.ClientError, OSError):
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _attempts(self, request_func, key, timeout, ceiling, priority, retries, delay):
+        """Retry loop behind _request_with_retry (breaker already checked)."""
+        reconnected = False
+        attempt = 0
+        while True:
+            if timeout is not None or key is None:
+                attempt_timeout = timeout if timeout is not None else ceiling
+            else:
+                attempt_timeout = self.latency.timeout_for(key, ceiling, attempt)
             try:
-                return await request_func()
+                async with self._scheduler.slot(priority), self._fleet_slot():
+                    t0 = time.monotonic()
+                    try:
+                        result = await request_func(attempt_timeout)
+                    except TimeoutError:
+                        if key is not None:
+                            self.latency.record(key, attempt_timeout)
+                        raise
+                    if key is not None:
+                        self.latency.record(key, time.monotonic() - t0)
+                    return result
             except (TimeoutError, aiohttp.ClientError, OSError) as err:
+                if not reconnected and isinstance(err, aiohttp.ServerDisconnectedError):
+                    reconnected = True
+                    _LOGGER.debug("Idle connection closed by device, reconnecting")
+                    continue
                 if attempt == retries:
                     raise
+                attempt += 1
                 _LOGGER.debug(
                     "Retry %d/%d after %s: %s",
-                    attempt + 1,
+                    attempt,
                     retries,
                     type(err).__name__,
                     err,
                 )
                 await asyncio.sleep(delay)
 
-    async def get_data(self, path: str, timeout: float = API_TIMEOUT_READ) -> list:
-        """GET /api/getData — serialized via lock."""
-        async with self._lock:
-            return await self._request_with_retry(lambda: self._do_get_data(path, timeout))
+    async def get_data(self, path: str, timeout: float | None = None) -> list:
+        """GET /api/getData — serialized via the scheduler at poll priority.
+
+        Without an explicit timeout the per-path learned timeout is used.
+        """
+        return await self._request_with_retry(
+            lambda t: self._do_get_data(path, t), f"getData {path}", timeout, API_TIMEOUT_READ
+        )
 
     async def _do_get_data(self, path: str, timeout: float) -> list:
         session = await self._ensure_session()
-        url = f"{self._base}/api/getData?path={quote(path, safe=':/')}&roles=value"
-        t0 = time.monotonic()
-        try:
+        url = f"{self._base}/api/getData?path={path_query(path)}&roles=value"
+        with self._measure("getData", path):
             async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
-                result = await resp.json(content_type=None)
-            self.last_response_time = round((time.monotonic() - t0) * 1000, 1)
-            self.total_requests += 1
-            return result
-        except Exception:
-            self.failed_requests += 1
-            self.total_requests += 1
-            raise
+                return await resp.json(content_type=None)
 
     async def set_data(
         self,
         path: str,
         value: dict,
         roles: str = "value",
-        timeout: float = API_TIMEOUT_WRITE,
+        timeout: float | None = None,
     ) -> str:
-        """GET /api/setData — serialized via lock."""
-        async with self._lock:
-            return await self._request_with_retry(lambda: self._do_set_data(path, value, roles, timeout))
+        """GET /api/setData — serialized via the scheduler at command priority.
+
+        Value writes are coalesced per path: while a write waits for the slot,
+        a newer write to the same path replaces its value and the superseded
+        caller returns "" immediately, so only the latest value is sent.
+        Activate actions (power, media control) are never coalesced.
+        Once the device has acknowledged the write, the status keys it can
+        change are recorded for take_affected().
+        """
+        if roles != "value":
+            result = await self._request_with_retry(
+                lambda t: self._do_set_data(path, value, roles, t),
+                f"setData {path}",
+                timeout,
+                API_TIMEOUT_WRITE,
+                PRIORITY_COMMAND,
+            )
+            self._affected.update(self._write_affects(path))
+            return result
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._path_write_seq[path] = self._path_write_seq.get(path, 0) + 1
+        superseded = self._pending_writes.get(path)
+        self._pending_writes[path] = (value, timeout, future)
+        if superseded is not None:
+            # A flush task is already queued for this path and will send our value
+            if not superseded[2].done():
+                superseded[2].set_result("")
+        else:
+            task = asyncio.create_task(self._flush_write(path))
+            self._write_tasks.add(task)
+            task.add_done_callback(self._write_tasks.discard)
+        return await future
+
+    async def _flush_write(self, path: str) -> None:
+        """Send the newest pending value for path once the device is free.
+
+        A retry is abandoned (the caller sees it as superseded) once a newer
+        write to the path was requested: the retry delay is spent outside the
+        slot, and the older value must not land after the newer one.
+        """
+        taken: list[tuple[dict, float | None, asyncio.Future[str]]] = []
+        taken_seq = 0
+
+        async def send(timeout: float) -> str:
+            nonlocal taken_seq
+            # Take the value only once we hold the slot, so later writes still coalesce
+            if not taken:
+                taken.append(self._pending_writes.pop(path))
+                taken_seq = self._path_write_seq[path]
+            elif self._path_write_seq[path] != taken_seq:
+                raise _WriteSuperseded
+            value = taken[0][0]
+            return await self._do_set_data(path, value, "value", timeout)
+
+        # Explicit timeout of the queued write, if any (normally learned)
+        fixed_timeout = self._pending_writes[path][1]
+        try:
+            result = await self._request_with_retry(
+                send, f"setData {path}", fixed_timeout, API_TIMEOUT_WRITE, PRIORITY_COMMAND
+            )
+        except asyncio.CancelledError:
+            pending = taken[0] if taken else self._pending_writes.pop(path, None)
+            if pending is not None and not pending[2].done():
+                pending[2].cancel()
+            raise
+        except _WriteSuperseded:
+            if not taken[0][2].done():
+                taken[0][2].set_result("")
+        except Exception as err:
+            # Nothing taken if the request was refused before it was sent
+            pending = taken[0] if taken else self._pending_writes.pop(path)
+            if not pending[2].done():
+                pending[2].set_exception(err)
+        else:
+            # Recorded on acknowledgement: a confirmation due while this write
+            # was queued or in flight must not take (and read) its keys early
+            self._affected.update(self._write_affects(path))
+            future = taken[0][2]
+            if not future.done():
+                future.set_result(result)
 
     async def _do_set_data(self, path: str, value: dict, roles: str, timeout: float) -> str:
         session = await self._ensure_session()
         val_str = json.dumps(value, separators=(",", ":"))
-        url = f"{self._base}/api/setData?path={quote(path, safe=':/')}&roles={roles}&value={quote(val_str)}"
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
-            return await resp.text()
+        url = f"{self._base}/api/setData?path={path_query(path)}&roles={roles}&value={quote(val_str)}"
+        with self._measure("setData", path):
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                return await resp.text()
 
     async def get_rows(self, path: str) -> dict:
-        """GET /api/getRows — serialized via lock."""
-        async with self._lock:
-            return await self._request_with_retry(lambda: self._do_get_rows(path))
+        """GET /api/getRows — serialized via the scheduler at poll priority."""
+        return await self._request_with_retry(
+            lambda t: self._do_get_rows(path, t), f"getRows {path}", None, API_TIMEOUT_READ
+        )
+
+    async def _get_batch_rows(self, root: str) -> dict:
+        """getRows for a batched status read: one attempt, outside the circuit breaker.
 
-    async def _do_get_rows(self, path: str) -> dict:
+        A failed batch falls back to per-key getData reads, which retry and
+        count towards the breaker themselves.
+        """
+        return await self._attempts(
+            lambda t: self._do_get_rows(root, t),
+            f"getRows {root}",
+            None,
+            API_TIMEOUT_READ,
+            PRIORITY_POLL,
+            0,
+            API_RETRY_DELAY,
+        )
+
+    async def _do_get_rows(self, path: str, timeout: float) -> dict:
         session = await self._ensure_session()
-        url = f"{self._base}/api/getRows?path={quote(path, safe=':/')}&roles=@all&from=0&to=65535&type=structure"
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=API_TIMEOUT_READ)) as resp:
-            return await resp.json(content_type=None)
+        url = f"{self._base}/api/getRows?path={path_query(path)}&roles=@all&from=0&to=65535&type=structure"
+        with self._measure("getRows", path):
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                return await resp.json(content_type=None)
+
+    # --- Write dependencies ---
+
+    @staticmethod
+    def _write_affects(path: str) -> tuple[str, ...]:
+        """Status keys a write to path can change (Param.affects)."""
+        if path == API_PATHS["power_req"]:
+            return ("power",)
+        if path == API_PATHS["player_control"]:
+            return ("player",)
+        param = PARAMS_BY_PATH.get(path)
+        return param.affects if param is not None else ()
+
+    def take_affected(self) -> set[str]:
+        """Status keys changed by acknowledged writes since the last call ("power" means everything)."""
+        affected, self._affected = self._affected, set()
+        return affected
+
+    # --- Batched reads ---
+
+    @staticmethod
+    def _batch_root(path: str) -> str | None:
+        """Longest BATCH_READ_ROOTS entry that covers path."""
+        best = None
+        for root in BATCH_READ_ROOTS:
+            if path.startswith(root) and (best is None or len(root) > len(best)):
+                best = root
+        return best
+
+    async def _read_batches(self, params: Mapping[str, Param], result: dict, budget: _PollBudget) -> set[str]:
+        """Read params grouped by subtree via getRows. Returns the keys resolved.
+
+        Rows are matched back to parameters by their full path. Keys whose row is
+        missing or fails to parse are left for the per-path getData fallback.
+        No subtree is requested once the budget is exhausted. A subtree that
+        answers without usable rows, or fails BATCH_READ_MAX_FAILURES times in
+        a row, is read per key from then on.
+        """
+        groups: dict[str, dict[str, str]] = {}
+        for key, param in params.items():
+            root = self._batch_root(param.path)
+            if root is not None and root not in self._batch_unsupported:
+                groups.setdefault(root, {})[param.path] = key
+
+        resolved: set[str] = set()
+        for root, by_path in groups.items():
+            if len(by_path) < 2:
+                continue  # a single parameter is cheaper via getData
+            if budget.exhausted():
+                break
+            budget.sent += 1
+            try:
+                data = await self._get_batch_rows(root)
+            except Exception:
+                failures = self._batch_failures[root] = self._batch_failures.get(root, 0) + 1
+                if failures >= BATCH_READ_MAX_FAILURES:
+                    _LOGGER.debug("Batch read of %s failed %d times, disabling it", root, failures)
+                    self._batch_unsupported.add(root)
+                else:
+                    _LOGGER.debug("Batch read of %s failed, falling back to getData", root)
+                continue
+            self._batch_failures.pop(root, None)
+            matched = 0
+            for row in data.get("rows", []) if isinstance(data, dict) else []:
+                key = by_path.get(row.get("path", ""))
+                if key is None or "value" not in row:
+                    continue
+                matched += 1
+                try:
+                    result[key] = params[key].parse([row["value"]])
+                    resolved.add(key)
+                except (AttributeError, IndexError, KeyError, TypeError):
+                    _LOGGER.debug("Unparseable row for %s in %s", key, root)
+            if not matched:
+                # Firmware answered but doesn't expose this subtree — stop asking
+                _LOGGER.debug("No usable rows under %s, disabling batch read", root)
+                self._batch_unsupported.add(root)
+        return resolved
 
     # --- Status polling with graceful degradation ---
 
-    async def get_status(self) -> dict:
+    def _resume_order(self, params: Mapping[str, Param]) -> dict[str, Param]:
+        """params in schema order, rotated to start at the poll cursor."""
+        if self._poll_cursor is None:
+            return dict(params)
+        order = list(PARAMS)
+        start = order.index(self._poll_cursor)
+        rank = {key: (i - start) % len(order) for i, key in enumerate(order)}
+        return {key: params[key] for key in sorted(params, key=rank.__getitem__)}
+
+    async def get_status(self, keys: Iterable[str] | None = None, budget: float | None = POLL_TIME_BUDGET) -> dict:
         """Poll device status. Individual failures fall back to last-known values.
 
+        keys limits the read to a subset of status keys (default: all); every
+        other key is served from the last poll's values.
+
         When the soundbar is in standby (networkStandby), only the power state
         is polled — the device is very slow to respond in this mode, so we skip
         all other parameters and keep cached values. This prevents response-time
         spikes (up to 40 s) and sensor unavailability during standby.
-        """
-        from .const import API_PATHS
-
-        ALL_PARAMS = {
-            "volume": (API_PATHS["volume"], lambda d: d[0].get("i32_", 0)),
-            "muted": (API_PATHS["mute"], lambda d: d[0].get("bool_", False)),
-            "input": (API_PATHS["input"], lambda d: d[0].get("cinemaPhysicalAudioInput", "unknown")),
-            "mode": (API_PATHS["mode"], lambda d: d[0].get("cinemaPostProcessorMode", "unknown")),
-            "night_mode": (
-                API_PATHS["night"],
-                lambda d: NIGHT_MODE_FROM_API.get(d[0].get("cinemaNightMode", "off"), "off"),
-            ),
-            "dialog_mode": (API_PATHS["dialog"], lambda d: d[0].get("cinemaDialogMode", "off")),
-            "bass": (API_PATHS["bass"], lambda d: d[0].get("i32_", 0)),
-            "mid": (API_PATHS["mid"], lambda d: d[0].get("i32_", 0)),
-            "treble": (API_PATHS["treble"], lambda d: d[0].get("i32_", 0)),
-            "decoder": (API_PATHS["decoder"], lambda d: d[0].get("cinemaAudioDecoder", "unknown")),
-            "eq_preset": (API_PATHS["eq_preset"], lambda d: d[0].get("cinemaEqPreset", "unknown")),
-            "dirac": (API_PATHS["dirac"], lambda d: d[0].get("i32_", -1)),
-            "sub_wired": (API_PATHS["sub_wired"], lambda d: d[0].get("i32_", 0)),
-            "sub_wireless": (API_PATHS["sub_wireless"], lambda d: d[0].get("i32_", 0)),
-            # Surround channel levels
-            "back_height": (API_PATHS["back_height"], lambda d: d[0].get("i32_", 0)),
-            "back_left": (API_PATHS["back_left"], lambda d: d[0].get("i32_", 0)),
-            "back_right": (API_PATHS["back_right"], lambda d: d[0].get("i32_", 0)),
-            "front_height": (API_PATHS["front_height"], lambda d: d[0].get("i32_", 0)),
-            "side_left": (API_PATHS["side_left"], lambda d: d[0].get("i32_", 0)),
-            "side_right": (API_PATHS["side_right"], lambda d: d[0].get("i32_", 0)),
-        }
 
+        When the device is on, parameters sharing a subtree (BATCH_READ_ROOTS)
+        are read with one getRows request; the rest use getData per path.
+
+        A slow device can't stretch a poll for minutes: once budget seconds
+        have passed no further read starts. The keys left unread keep their
+        cached values and are listed in stale_params; the next poll starts at
+        the first of them, so every parameter is still refreshed over time.
+        """
         poll_start = time.monotonic()
+        poll_budget = _PollBudget(budget)
+
+        # Parameters actually read this poll, resuming where the last one stopped
+        to_read = self._resume_order(PARAMS if keys is None else {key: PARAMS[key] for key in keys if key in PARAMS})
 
         # ── Step 1: probe power state first ──
+        # Learned timeouts reflect the bar while on; a sleeping bar answers far
+        # slower, so the probe keeps the full timeout unless it was on last time.
+        probe_timeout = None if self._last_status.get("power") == "online" else API_TIMEOUT_READ
         try:
-            power_data = await self.get_data(API_PATHS["power"])
+            power_data = await self.get_data(API_PATHS["power"], timeout=probe_timeout)
             power = power_data[0].get("powerTarget", {}).get("target", "unknown")
         except Exception:
             # Cannot reach device at all → offline
             return {"online": False}
 
+        # Preserve all previously known values so sensors stay available;
+        # whatever is read below overwrites them.
+        result: dict = {key: self._last_status[key] for key in PARAMS if key in self._last_status}
+        result.update(online=True, power=power)
+
         # ── Step 2: standby → return cached data, skip heavy polling ──
         if power == "networkStandby":
-            result: dict = {"online": True, "power": power}
-            # Preserve all previously known values so sensors stay available
-            for key in ALL_PARAMS:
-                cached = self._last_status.get(key)
-                if cached is not None:
-                    result[key] = cached
             result["poll_time_ms"] = round((time.monotonic() - poll_start) * 1000)
             result["failed_params"] = 0
+            result["stale_params"] = []
             self._last_status = result
             _LOGGER.debug("Device in standby — lightweight poll (%d ms)", result["poll_time_ms"])
             return result
 
-        # ── Step 3: device is ON → full poll ──
-        result = {"online": True, "power": power}
-        fail_count = 0
+        # ── Step 3: device is ON → poll requested keys (batched subtrees, then getData) ──
+        fail_count, unread = await self._read_params(to_read, result, poll_budget)
+
+        # If ALL parameters read (besides power) failed, device is truly offline
+        attempted = len(to_read) - len(unread)
+        if attempted and fail_count == attempted:
+            return {"online": False}
+
+        if unread:
+            _LOGGER.debug("Poll budget used up, %d parameters left for the next poll", len(unread))
+        self._poll_cursor = unread[0] if unread else None
+        result["poll_time_ms"] = round((time.monotonic() - poll_start) * 1000)
+        result["failed_params"] = fail_count
+        result["stale_params"] = unread
+        self._last_status = result
+        return result
 
-        for key, (path, parser) in ALL_PARAMS.items():
+    async def _read_params(
+        self, to_read: Mapping[str, Param], result: dict, budget: _PollBudget | None = None
+    ) -> tuple[int, list[str]]:
+        """Read params into result: batched subtrees, then getData.
+
+        Returns the failure count and the keys left unread once the budget
+        was exhausted (in reading order).
+        """
+        budget = budget or _PollBudget(None)
+        fail_count = 0
+        unread: list[str] = []
+        batched = await self._read_batches(to_read, result, budget)
+        for key, param in to_read.items():
+            if key in batched:
+                continue
+            if budget.exhausted():
+                unread.append(key)
+                continue
+            budget.sent += 1
             try:
-                data = await self.get_data(path)
-                result[key] = parser(data)
+                data = await self.get_data(param.path)
+                result[key] = param.parse(data)
             except Exception:
                 fail_count += 1
-                # Fall back to last-known value
-                cached = self._last_status.get(key)
-                if cached is not None:
-                    result[key] = cached
+                # Fall back to last-known value (already in result)
+                if key in result:
                     _LOGGER.debug("Using cached value for %s", key)
                 else:
                     _LOGGER.debug("No cached value for %s, skipping", key)
+        return fail_count, unread
 
-        # If ALL parameters failed (besides power), device is truly offline
-        if fail_count == len(ALL_PARAMS):
-            return {"online": False}
+    async def read_keys(self, keys: Iterable[str]) -> dict:
+        """Re-read only these status keys, without the power probe. Returns the values read.
 
-        result["poll_time_ms"] = round((time.monotonic() - poll_start) * 1000)
-        result["failed_params"] = fail_count
-        self._last_status = result
+        Used to confirm a command: a volume change costs one request, not a poll.
+        """
+        to_read = {key: PARAMS[key] for key in keys if key in PARAMS}
+        result: dict = {}
+        await self._read_params(to_read, result)
+        self._last_status.update(result)
         return result
 
+    # --- Event queue (push updates) ---
+
+    def event_paths(self) -> list[str]:
+        """Paths to subscribe to: every status parameter plus power and player."""
+        return [*PARAMS_BY_PATH, API_PATHS["power"], API_PATHS["player"]]
+
+    async def subscribe_events(self, paths: Iterable[str]) -> str:
+        """POST /api/event/modifyQueue — create an event queue, return its id."""
+        payload = {
+            "subscribe": [{"path": path, "type": "itemWithValue"} for path in paths],
+            "unsubscribe": [],
+        }
+        return await self._request_with_retry(lambda t: self._do_subscribe_events(payload, t))
+
+    async def _do_subscribe_events(self, payload: dict, timeout: float) -> str:
+        session = await self._ensure_session()
+        url = f"{self._base}/api/event/modifyQueue"
+        async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status in (400, 404, 405):
+                raise EventsNotSupportedError(f"modifyQueue returned HTTP {resp.status}")
+            resp.raise_for_status()
+            queue_id = await resp.json(content_type=None)
+        if not isinstance(queue_id, str) or not queue_id:
+            raise EventsNotSupportedError(f"Unexpected modifyQueue response: {queue_id!r}")
+        return queue_id
+
+    async def poll_events(self, queue_id: str, timeout: float = EVENT_POLL_TIMEOUT) -> list[dict]:
+        """GET /api/event/pollQueue — wait for events, return them (empty on timeout).
+
+        Not serialized through the scheduler: the device holds this request open
+        until something changes, and commands and polls must not wait behind it.
+        """
+        session = await self._ensure_session()
+        url = f"{self._base}/api/event/pollQueue?queueId={quote(queue_id, safe='')}&timeout={timeout}"
+        client_timeout = aiohttp.ClientTimeout(total=timeout + API_TIMEOUT_READ)
+        async with session.get(url, timeout=client_timeout) as resp:
+            resp.raise_for_status()
+            events = await resp.json(content_type=None)
+        return events if isinstance(events, list) else []
+
+    def parse_events(self, events: list[dict]) -> dict:
+        """Map event queue items onto status keys (the last event per key wins).
+
+        Parameter values are also written to the status cache, so the next
+        partial poll builds on them.
+        """
+        changes: dict = {}
+        for event in events:
+            path = event.get("path")
+            value = event.get("itemValue")
+            if not isinstance(value, dict):
+                continue
+            if path == API_PATHS["power"]:
+                changes["power"] = value.get("powerTarget", {}).get("target", "unknown")
+            elif path == API_PATHS["player"]:
+                changes["player"] = value
+            elif (param := PARAMS_BY_PATH.get(path)) is not None:
+                try:
+                    changes[param.key] = param.parse([value])
+                except (AttributeError, IndexError, KeyError, TypeError):
+                    _LOGGER.debug("Unparseable event for %s", path)
+        self._last_status.update({key: value for key, value in changes.items() if key in PARAMS})
+        return changes
+
     # --- Setters ---
 
-    async def set_volume(self, level: int) -> None:
-        from .const import API_PATHS
+    async def write(self, key: str, value: Any) -> None:
+        """Write a status key's value, wrapped in the envelope its Param defines."""
+        param = PARAMS[key]
+        await self.set_data(param.path, param.encode(value))
 
-        await self.set_data(API_PATHS["volume"], {"type": "i32_", "i32_": level})
+    async def set_volume(self, level: int) -> None:
+        await self.write("volume", level)
 
     async def set_mute(self, muted: bool) -> None:
-        from .const import API_PATHS
-
-        await self.set_data(API_PATHS["mute"], {"type": "bool_", "bool_": muted})
+        await self.write("muted", muted)
 
     async def set_input(self, source: str) -> None:
-        from .const import API_PATHS
-
-        await self.set_data(
-            API_PATHS["input"],
-            {"type": "cinemaPhysicalAudioInput", "cinemaPhysicalAudioInput": source},
-        )
+        await self.write("input", source)
 
     async def set_sound_mode(self, mode: str) -> None:
-        from .const import API_PATHS
-
-        await self.set_data(
-            API_PATHS["mode"],
-            {"type": "cinemaPostProcessorMode", "cinemaPostProcessorMode": mode},
-        )
+        await self.write("mode", mode)
 
     async def set_night_mode(self, mode: str) -> None:
-        from .const import API_PATHS
-
-        api_val = NIGHT_MODE_TO_API.get(mode, mode)
-        await self.set_data(
-            API_PATHS["night"],
-            {"type": "cinemaNightMode", "cinemaNightMode": api_val},
-        )
+        await self.write("night_mode", mode)
 
     async def set_dialog_mode(self, mode: str) -> None:
-        from .const import API_PATHS
-
-        await self.set_data(
-            API_PATHS["dialog"],
-            {"type": "cinemaDialogMode", "cinemaDialogMode": mode},
-        )
+        await self.write("dialog_mode", mode)
 
     async def set_channel_level(self, param: str, value: int) -> None:
         """Set any channel level (bass/mid/treble/surround/sub) by key."""
-        from .const import API_PATHS
-
-        await self.set_data(API_PATHS[param], {"type": "i32_", "i32_": value})
+        await self.write(param, value)
 
     # Legacy aliases
     set_eq = set_channel_level
     set_sub = set_channel_level
 
     async def set_eq_preset(self, preset: str) -> None:
-        from .const import API_PATHS
-
-        await self.set_data(
-            API_PATHS["eq_preset"],
-            {"type": "cinemaEqPreset", "cinemaEqPreset": preset},
-        )
+        await self.write("eq_preset", preset)
 
     async def set_dirac(self, filter_id: int) -> None:
-        from .const import API_PATHS
-
-        await self.set_data(API_PATHS["dirac"], {"type": "i32_", "i32_": filter_id})
+        await self.write("dirac", filter_id)
 
     async def set_power(self, target: str) -> None:
-        from .const import API_PATHS
-
         await self.set_data(
             API_PATHS["power_req"],
             {"target": target, "reason": "userActivity"},
@@ -291,14 +805,35 @@ class KlipschAPI:
             timeout=API_TIMEOUT_POWER,
         )
 
+    async def apply_profile(self, profile: dict, current: dict, written: list[str] | None = None) -> list[str]:
+        """Write the status keys of profile that differ from current. Returns the keys written.
+
+        Writes go one at a time in PROFILE_WRITE_ORDER, so settings that depend
+        on others (levels after the EQ preset, night mode after the sound mode)
+        are sent last. Once a key is written, the profile keys it can reset
+        (Param.affects) are sent even if current already matches: the device
+        may just have changed them. A profile that is already active sends
+        nothing.
+
+        Each acknowledged key is also appended to written, if given, so a
+        caller still knows what reached the device when a later write raises.
+        """
+        written = [] if written is None else written
+        reset: set[str] = set()  # keys whose current value a write may have changed
+        for key in PROFILE_WRITE_ORDER:
+            if key not in profile or (key not in reset and current.get(key) == profile[key]):
+                continue
+            await self.write(key, profile[key])
+            written.append(key)
+            reset.update(PARAMS[key].affects)
+        return written
+
     async def get_dirac_filters(self) -> list[dict]:
         data = await self.get_rows("dirac:filters")
         return [{"id": r["value"]["i32_"], "name": r["title"]} for r in data.get("rows", [])]
 
     async def get_player_data(self) -> dict | None:
         """Fetch current player/media data."""
-        from .const import API_PATHS
-
         try:
             data = await self.get_data(API_PATHS["player"])
             if data and isinstance(data, list) and len(data) > 0:
@@ -309,8 +844,6 @@ class KlipschAPI:
 
     async def media_control(self, control: str) -> None:
         """Send media control command (pause/next/previous)."""
-        from .const import API_PATHS
-
         await self.set_data(
             API_PATHS["player_control"],
             {"control": control},
@@ -322,13 +855,16 @@ class KlipschAPI:
 
         Returns eureka_info with name, mac_address, build_version, uptime, etc.
         Useful for device identification and firmware version display.
+        Serialized on the Cast slot only: it doesn't wait for port-80 requests.
         """
         session = await self._ensure_session()
-        url = f"http://{self._host}:8008/setup/eureka_info"
+        url = f"{self._cast_base}/setup/eureka_info"
         try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                if resp.status == 200:
-                    return await resp.json(content_type=None)
+            async with self._cast_scheduler.slot(), self._fleet_slot():
+                with self._measure("eureka", "/setup/eureka_info", self.cast_metrics):
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                        if resp.status == 200:
+                            return await resp.json(content_type=None)
         except Exception:
             _LOGGER.debug("Failed to get eureka_info from port 8008")
         return None
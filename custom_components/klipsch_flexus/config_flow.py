@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 from ipaddress import IPv4Address
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST
 from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 try:
     from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
@@ -15,7 +17,7 @@ except ImportError:  # HA < 2026.2
     from homeassistant.components.zeroconf import ZeroconfServiceInfo
 
 from .api import KlipschAPI
-from .const import CONF_SCAN_INTERVAL, DOMAIN, SCAN_INTERVAL_SECONDS
+from .const import CONF_FLEET_MAX_CONCURRENT, CONF_SCAN_INTERVAL, DOMAIN, FLEET_MAX_CONCURRENT, SCAN_INTERVAL_SECONDS
 
 
 class KlipschFlexusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -95,12 +97,12 @@ class KlipschFlexusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             host = user_input[CONF_HOST]
-            api = KlipschAPI(host)
+            api = KlipschAPI(host, session=async_get_clientsession(self.hass))
             try:
-                status = await api.get_status()
+                # eureka_info (stable unique ID from the MAC) comes from the Cast
+                # server on port 8008 — asked at the same time as the port-80 probe
+                status, device_info = await asyncio.gather(api.get_status(), api.get_device_info())
                 if status.get("online"):
-                    # Try eureka_info for stable unique ID (MAC) and model check
-                    device_info = await api.get_device_info()
                     unique_id = host
                     title = f"Klipsch Flexus ({host})"
                     if device_info:
@@ -140,7 +142,7 @@ class KlipschFlexusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             host = user_input[CONF_HOST]
-            api = KlipschAPI(host)
+            api = KlipschAPI(host, session=async_get_clientsession(self.hass))
             try:
                 status = await api.get_status()
                 if status.get("online"):
@@ -185,6 +187,11 @@ class KlipschOptionsFlow(config_entries.OptionsFlow):
                         CONF_SCAN_INTERVAL,
                         default=self._entry.options.get(CONF_SCAN_INTERVAL, SCAN_INTERVAL_SECONDS),
                     ): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
+                    # Shared by all soundbars: the lowest value of any entry applies
+                    vol.Optional(
+                        CONF_FLEET_MAX_CONCURRENT,
+                        default=self._entry.options.get(CONF_FLEET_MAX_CONCURRENT, FLEET_MAX_CONCURRENT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
                 }
             ),
         )
@@ -4,19 +4,79 @@ DOMAIN = "klipsch_flexus"
 DEFAULT_PORT = 80
 SCAN_INTERVAL_SECONDS = 15
 SCAN_INTERVAL_STANDBY = 60  # slower polling when soundbar is in standby
+SCAN_INTERVAL_PUSH = 300  # consistency poll while subscribed to the event queue
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_FLEET_MAX_CONCURRENT = "fleet_max_concurrent"
+
+# Event queue (push updates)
+EVENT_POLL_TIMEOUT = 25  # seconds the device may hold a pollQueue request open
+EVENT_RESUBSCRIBE_DELAY = 30  # seconds before re-subscribing after the queue is lost
+EVENT_POLL_MIN_INTERVAL = 1  # seconds between pollQueue requests the device answers at once
+EVENT_POLL_MAX_BACKOFF = 30  # seconds, upper bound while such requests come back empty
 
 # API timeouts (seconds) — soundbar is single-threaded and slow
 API_TIMEOUT_READ = 8
 API_TIMEOUT_WRITE = 10
 API_TIMEOUT_POWER = 15  # device needs time to wake up
 
+# Adaptive timeouts — learned per request kind from recent response times.
+# The API_TIMEOUT_* values above are the cold-start timeouts and the ceilings.
+TIMEOUT_MIN_SAMPLES = 5  # samples before learned timeouts replace the fixed ones
+TIMEOUT_SAMPLE_WINDOW = 50  # recent samples kept for percentiles
+TIMEOUT_EWMA_ALPHA = 0.2
+TIMEOUT_EWMA_FACTOR = 4  # timeout ≥ 4 × average latency
+TIMEOUT_P99_FACTOR = 2  # timeout ≥ 2 × p99 latency
+TIMEOUT_FLOOR = 1.0  # seconds
+
+# Request metrics — upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Poll classes (schema.POLL_CLASSES) — minimum seconds between reads of each
+# class (0 = every tick)
+POLL_CLASS_INTERVALS = {"hot": 0, "warm": 60, "cold": 300}
+
+# Connection pool for a standalone KlipschAPI (inside HA the shared session is used)
+API_CONNECTIONS_PER_HOST = 2  # one for serialized requests, one for the event long-poll
+API_KEEPALIVE_TIMEOUT = 30  # seconds an idle connection is kept open
+API_DNS_CACHE_TTL = 300  # seconds
+
+# Poll time budget — no new parameter read starts after this many seconds;
+# the next poll resumes at the first key left unread
+POLL_TIME_BUDGET = 10
+
+# Polls for which the last state is kept (marked stale) while port 80 fails
+# but the Cast server on port 8008 still answers; then the bar is offline
+CAST_LIVENESS_MAX_POLLS = 3
+
 # Retry settings
 API_RETRIES = 2
 API_RETRY_DELAY = 0.5  # seconds between retries
 
+# Circuit breaker — stop talking to a bar that doesn't answer
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failed requests before opening
+BREAKER_BACKOFF_BASE = 15  # seconds until the first recovery probe
+BREAKER_BACKOFF_MAX = 300  # cap for the exponential probe schedule
+BREAKER_JITTER = 0.2  # ± fraction of randomness added to each backoff
+
+# Fleet scheduling across all configured soundbars (hass.data[DOMAIN][FLEET_KEY])
+FLEET_KEY = "_fleet"  # reserved key, never a config entry id
+FLEET_MAX_CONCURRENT = 4  # requests in flight across all devices (default of the option)
+FLEET_RATE_WINDOW = 60  # seconds over which the fleet request rate is reported
+
+# Player data — only inputs that carry now-playing metadata are polled
+# (or while the last payload was playing/paused, to see it stop)
+STREAMING_INPUTS = frozenset({"googlecast", "airplay", "bluetooth"})
+PLAYER_TRACK_END_MARGIN = 2  # seconds after the expected track end to re-read
+
+# Persistent state snapshot (instant startup after HA restarts)
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30  # seconds; writes are batched
+REBOOT_TOLERANCE = 120  # seconds of boot-time drift before assuming a reboot
+
 # Delay before refresh after command (let device process)
 COMMAND_REFRESH_DELAY = 1.0
+# Seconds an optimistic value overrides older device reads unless confirmed
+OPTIMISTIC_WRITE_TTL = 15
 
 # API paths
 API_PATHS = {
@@ -47,6 +107,16 @@ API_PATHS = {
     "player_control": "player:player/control",
 }
 
+# Subtrees read in one getRows(type=structure) request during status polling.
+# Each parameter is batched under the longest root its path starts with;
+# parameters outside every root (or missing from the rows) use getData.
+BATCH_READ_ROOTS = [
+    "settings:/cinema/dsp",
+    "settings:/cinema",
+    "cinema:",
+]
+BATCH_READ_MAX_FAILURES = 3  # failed getRows in a row before a subtree is read per key
+
 # Channel levels — surround speakers, subwoofers, then tone controls
 # Display names are handled by translations (entity.number.<key>.name)
 CHANNEL_LEVELS = [
@@ -92,5 +162,26 @@ DIALOG_MODES = ["off", "dialog_1", "dialog_2", "dialog_3"]
 # EQ Presets
 EQ_PRESETS = ["flat", "bass", "rock", "vocal"]
 
+# Services
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+
+# Sound profiles (apply_profile, snapshot/restore services) — write order.
+# Settings that can reset others go first: input and sound mode, then EQ
+# preset and Dirac filter, then the levels and modes that build on them;
+# volume last.
+PROFILE_WRITE_ORDER = [
+    "input",
+    "mode",
+    "eq_preset",
+    "dirac",
+    *(key for key, _icon in CHANNEL_LEVELS),
+    "night_mode",
+    "dialog_mode",
+    "volume",
+    "muted",
+]
+
 # Dirac filters (discovered dynamically, but defaults)
 DIRAC_OFF = -1
@@ -2,28 +2,86 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
 import logging
+import time
+from collections import Counter
+from collections.abc import Callable, Collection, Iterable
 from datetime import timedelta
+from typing import Any, NamedTuple
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import KlipschAPI
+from .api import EventsNotSupportedError, KlipschAPI
 from .const import (
+    CAST_LIVENESS_MAX_POLLS,
     COMMAND_REFRESH_DELAY,
     DOMAIN,
+    EVENT_POLL_MAX_BACKOFF,
+    EVENT_POLL_MIN_INTERVAL,
+    EVENT_RESUBSCRIBE_DELAY,
+    OPTIMISTIC_WRITE_TTL,
+    PLAYER_TRACK_END_MARGIN,
+    POLL_CLASS_INTERVALS,
+    PROFILE_WRITE_ORDER,
+    REBOOT_TOLERANCE,
+    SCAN_INTERVAL_PUSH,
     SCAN_INTERVAL_SECONDS,
     SCAN_INTERVAL_STANDBY,
+    STORAGE_SAVE_DELAY,
+    STREAMING_INPUTS,
 )
+from .schema import PARAMS, POLL_CLASSES
+from .status import OFFLINE, DeviceStatus
 
 _LOGGER = logging.getLogger(__name__)
 
+# Keys every entity depends on (availability, standby handling, restored snapshot)
+ALWAYS_NOTIFY_KEYS = frozenset({"online", "power", "stale"})
+
+# Status keys not worth persisting: per-poll figures and media info
+_UNSTORED_KEYS = frozenset({"failed_params", "player", "poll_time_ms", "stale_params"})
+
+# Set in a task whose refresh carries out a request already counted (a
+# command confirmation escalated to a full poll), so it isn't counted twice
+_REQUEST_COUNTED: contextvars.ContextVar[bool] = contextvars.ContextVar("klipsch_request_counted", default=False)
+
+
+class _PendingWrite(NamedTuple):
+    """Optimistic value shown until the device confirms it (write overlay)."""
+
+    value: Any
+    seq: int  # write sequence number at acknowledgement
+    deadline: float  # loop time after which device reads win again
+
+
+# Listener context key for the Dirac filter catalog, which isn't part of the status
+DIRAC_FILTERS_KEY = "dirac_filters"
+
+
+def status_keys(*keys: str) -> frozenset[str]:
+    """Listener context: notify only when one of these status keys changes."""
+    return ALWAYS_NOTIFY_KEYS.union(keys)
+
 
 class KlipschCoordinator(DataUpdateCoordinator[dict]):
     """Coordinator to poll Klipsch device status."""
 
     def __init__(
-        self, hass: HomeAssistant, api: KlipschAPI, name: str, scan_interval: int = SCAN_INTERVAL_SECONDS
+        self,
+        hass: HomeAssistant,
+        api: KlipschAPI,
+        name: str,
+        scan_interval: int = SCAN_INTERVAL_SECONDS,
+        store: Store | None = None,
     ) -> None:
         super().__init__(
             hass,
@@ -34,64 +92,749 @@ class KlipschCoordinator(DataUpdateCoordinator[dict]):
         self.api = api
         self.dirac_filters: list[dict] = []
         self.device_info: dict | None = None  # eureka_info from port 8008
+        # Snapshot of the last good state, restored at startup
+        self._store = store
+        self._good_status: dict = {}  # last status read from the awake bar, as stored
+        self._device_info_live = False  # device_info fetched since startup
+        self._boot_time: float | None = None  # wall clock time of the bar's last boot
+        self._first_stage = False  # staged first refresh: hot keys only
+        self._cast_only_polls = 0  # polls in a row answered by the Cast server only
+        # Track-end prediction for player polls (the API reports no position)
+        self._track_title: str | None = None
+        self._track_elapsed = 0.0  # seconds played before _track_resumed_at
+        self._track_resumed_at: float | None = None  # monotonic, None unless playing
+        self._unsub_track_end = None
+        # Named audio state snapshots (snapshot/restore services), in memory only
+        self.snapshots: dict[str, dict] = {}
+        self._deferred_pending = False  # live data still to load after setup
+        self._unsub_phase = None  # pending fleet phase offset of the poll timer
         self._normal_interval = timedelta(seconds=scan_interval)
         self._standby_interval = timedelta(seconds=SCAN_INTERVAL_STANDBY)
+        self._push_interval = timedelta(seconds=SCAN_INTERVAL_PUSH)
+        self.push_active = False  # subscribed to the device event queue
+        # Tiered polling: monotonic time each poll class was last read
+        self._class_polled_at: dict[str, float] = {}
+        self._force_full_poll = True
+        # Key-scoped fan-out: status as last dispatched to listeners
+        self._dispatched: dict | None = None
+        self._dispatched_success = True
+        self._dispatched_filters: list[dict] = []
+        # Entity-facing snapshot of data and the dict it was built from
+        self._status = OFFLINE
+        self._status_source: dict | None = None
+        # Single-flight refresh: the poll in progress and what it reads
+        self._refresh_inflight: asyncio.Future[dict] | None = None
+        self._refresh_started_at = float("-inf")  # loop time
+        self._refresh_keys: frozenset[str] = frozenset()
+        # Debounced confirmation of commands (one pending timer at most)
+        self._confirm_handle: asyncio.TimerHandle | None = None
+        self._confirm_due = 0.0  # loop time
+        self._last_command_at = float("-inf")  # loop time
+        # Write overlay: acknowledged writes not yet confirmed by a read
+        self._pending_writes: dict[str, _PendingWrite] = {}
+        self._write_seq = 0
+        # Demand-driven polling: status key → number of consumers
+        self._demand: Counter[str] = Counter()
+        # Refresh requests vs. device reads actually made (diagnostics)
+        self.refresh_counts = {"requested": 0, "coalesced": 0, "executed": 0}
+
+    @property
+    def status(self) -> DeviceStatus:
+        """Typed, immutable view of data, rebuilt once whenever data is replaced."""
+        if self.data is not self._status_source:
+            self._status = DeviceStatus.from_data(self.data)
+            self._status_source = self.data
+        return self._status
+
+    @property
+    def breaker_state(self) -> str:
+        """Circuit breaker state of the API: closed, open or half_open."""
+        return self.api.breaker.state
+
+    # --- Persistent snapshot ---
+
+    async def async_restore(self) -> bool:
+        """Load the stored snapshot as initial data (marked stale). True if restored."""
+        if self._store is None or (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            status = dict(stored["status"])
+            self.dirac_filters = list(stored["dirac_filters"])
+            self.device_info = stored["device_info"]
+            self._boot_time = stored["boot_time"]
+        except (KeyError, TypeError):
+            _LOGGER.debug("Ignoring unreadable state snapshot")
+            return False
+        self._good_status = dict(status)
+        # Dropped by the first live refresh, which notifies every entity
+        status["stale"] = True
+        self.data = status
+        self._deferred_pending = True  # live refresh via async_start_deferred_load
+        return True
+
+    def _data_to_store(self) -> dict:
+        return {
+            "status": self._good_status,
+            "dirac_filters": self.dirac_filters,
+            "device_info": self.device_info,
+            "boot_time": self._boot_time,
+        }
+
+    @callback
+    def _async_schedule_save(self, status: dict) -> None:
+        """Save status read from the device, copied now: the write happens up to
+        STORAGE_SAVE_DELAY later (or at shutdown), when data may be the offline
+        placeholder.
+        """
+        self._good_status = {
+            key: value for key, value in status.items() if key not in _UNSTORED_KEYS and key != "stale"
+        }
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    def _check_device_identity(self, info: dict) -> None:
+        """Drop restored Dirac filters if the bar rebooted or changed firmware."""
+        boot_time = None
+        if isinstance(info.get("uptime"), (int, float)):
+            boot_time = time.time() - info["uptime"]
+        previous, self._boot_time = self._boot_time, boot_time
+        if self.device_info is None:
+            return  # nothing restored to compare against
+        if self.device_info.get("cast_build_revision") != info.get("cast_build_revision"):
+            reason = "firmware changed"
+        elif previous is not None and boot_time is not None and abs(boot_time - previous) > REBOOT_TOLERANCE:
+            reason = "device rebooted"
+        else:
+            return
+        _LOGGER.debug("Invalidating stored state: %s", reason)
+        self.dirac_filters = []
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only listeners subscribed to keys that changed.
+
+        Listeners registered with a status_keys() context are skipped when none
+        of their keys differ from the previous dispatch; listeners without a
+        context are always notified. A change in update success wakes everyone;
+        a new Dirac filter catalog counts as a change of DIRAC_FILTERS_KEY.
+        """
+        data = self.data or {}
+        previous = self._dispatched
+        if previous is None or self.last_update_success != self._dispatched_success:
+            changed = None
+        else:
+            changed = {key for key in data.keys() | previous.keys() if data.get(key) != previous.get(key)}
+            if self.dirac_filters != self._dispatched_filters:
+                changed.add(DIRAC_FILTERS_KEY)
+        # Copy: the API's status cache can share this dict and is updated in place
+        self._dispatched = dict(data)
+        self._dispatched_success = self.last_update_success
+        self._dispatched_filters = self.dirac_filters
+
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or not context.isdisjoint(changed):
+                update_callback()
+
+    # --- Demand-driven polling ---
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: Any = None) -> Callable[[], None]:
+        """Listen for updates; a status_keys() context also demands its keys."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if not isinstance(context, frozenset):
+            return remove_listener
+        remove_demand = self.async_add_demand(context)
+
+        @callback
+        def remove() -> None:
+            remove_demand()
+            remove_listener()
+
+        return remove
+
+    @callback
+    def async_add_demand(self, keys: Iterable[str]) -> Callable[[], None]:
+        """Register a consumer of status keys; returns the function removing it.
+
+        Regular polls read only demanded keys. Entities demand their listener
+        context while enabled (disabled entities never subscribe); until
+        anything registers, every key is polled. Keys that gain their first
+        consumer after setup are read at once.
+        """
+        keys = frozenset(key for key in keys if key in PARAMS)
+        new = [key for key in keys if not self._demand[key]]
+        self._demand.update(keys)
+        data = self.data or {}
+        if new and data and not data.get("stale") and not self._deferred_pending:
+            self.hass.async_create_task(self.async_fetch_keys(new))
+
+        @callback
+        def remove() -> None:
+            self._demand.subtract(keys)
+            for key in keys:
+                if self._demand[key] <= 0:
+                    del self._demand[key]
+
+        return remove
+
+    @property
+    def polled_params(self) -> list[str]:
+        """Parameters regular polls read."""
+        return self._polled(PARAMS)
+
+    def _polled(self, keys: Iterable[str]) -> list[str]:
+        """The keys regular polling reads: those with a consumer."""
+        if not self._demand:
+            return list(keys)
+        return [key for key in keys if key in self._demand]
+
+    async def _async_read_unpolled(self, keys: Iterable[str]) -> None:
+        """Bring keys outside regular polling up to date before a service uses them."""
+        if self._demand and (unpolled := [key for key in keys if key in PARAMS and key not in self._demand]):
+            await self.async_fetch_keys(unpolled)
+
+    async def async_fetch_keys(self, keys: Iterable[str]) -> None:
+        """Read status keys now, outside the poll schedule, and publish them."""
+        keys = list(keys)
+        data = self.data or {}
+        if not data.get("online") or data.get("power") == "networkStandby":
+            return
+        started = self._write_seq
+        try:
+            values = await self.api.read_keys(keys)
+        except Exception:
+            _LOGGER.debug("Failed to read %s on demand", ", ".join(sorted(keys)))
+            return
+        if values:
+            self._async_merge_update(self._reconcile({**(self.data or {}), **values}, values, started))
+
+    @callback
+    def _async_merge_update(self, data: dict) -> None:
+        """Publish a partial update (event, confirmation, single read).
+
+        Unlike async_set_updated_data the poll timer is left alone, so a
+        steady stream of partial updates can't postpone the full poll.
+        """
+        self.data = data
+        self.async_update_listeners()
+
+    def _due_poll_classes(self) -> list[str]:
+        """Poll classes whose interval has elapsed (all of them after a command)."""
+        if self._force_full_poll:
+            return list(POLL_CLASSES)
+        now = time.monotonic()
+        return [
+            name
+            for name in POLL_CLASSES
+            if now - self._class_polled_at.get(name, float("-inf")) >= POLL_CLASS_INTERVALS[name]
+        ]
 
     async def _async_update_data(self) -> dict:
+        """Single-flight update: a refresh arriving during a poll shares its result.
+
+        Covers every refresh path (scheduled tick, requested refresh, first
+        refresh), e.g. the tick firing while a requested refresh runs; the
+        finished poll re-arms the timer, so that tick is skipped, not repeated.
+        """
+        if not _REQUEST_COUNTED.get():
+            self.refresh_counts["requested"] += 1
+        if self._refresh_inflight is not None:
+            self.refresh_counts["coalesced"] += 1
+            return await asyncio.shield(self._refresh_inflight)
+        self._refresh_inflight = inflight = self.hass.loop.create_future()
+        # Retrieved here so a failure nobody else awaited isn't logged as lost
+        inflight.add_done_callback(lambda fut: fut.cancelled() or fut.exception())
+        self._refresh_started_at = self.hass.loop.time()
+        self._refresh_keys = frozenset()
+        self.refresh_counts["executed"] += 1
+        try:
+            data = await self._async_poll()
+        except asyncio.CancelledError:
+            inflight.cancel()
+            raise
+        except Exception as err:
+            inflight.set_exception(err)
+            raise
+        else:
+            inflight.set_result(data)
+            return data
+        finally:
+            self._refresh_inflight = None
+
+    async def _async_poll(self) -> dict:
+        started = self._write_seq
+        due = ["hot"] if self._first_stage else self._due_poll_classes()
+        keys = self._polled(key for name in due for key in POLL_CLASSES[name])
+        # Keys the last poll's time budget left unread are due again at once
+        keys += [key for key in self._polled((self.data or {}).get("stale_params", ())) if key not in keys]
+        # The player is read along with every poll after the first stage
+        self._refresh_keys = frozenset(keys if self._first_stage else [*keys, "player"])
         try:
-            status = await self.api.get_status()
+            if self._first_stage or self._device_info_live:
+                status = await self.api.get_status(keys)
+            else:
+                # eureka_info comes from the Cast server (port 8008): fetch it alongside
+                status, _ = await asyncio.gather(self.api.get_status(keys), self._async_fetch_device_info())
         except Exception as err:
             raise UpdateFailed(f"Error communicating with Klipsch: {err}") from err
 
         if not status.get("online"):
+            previous = self.data or {}
+            if (
+                previous.get("online")
+                and self._cast_only_polls < CAST_LIVENESS_MAX_POLLS
+                and await self.api.get_device_info() is not None
+            ):
+                # Second liveness signal: the Cast server still answers, so the
+                # bar is up and only its API failed. The last state stays
+                # (marked stale) for a few polls before the bar counts as offline
+                self._cast_only_polls += 1
+                return {**previous, "stale": True}
+            self._cast_only_polls = 0
+            # Re-read everything once the bar is reachable again
+            self._class_polled_at.clear()
             return {"online": False}
+        self._cast_only_polls = 0
 
         # Adaptive polling interval: slow down in standby, speed up when on
         is_standby = status.get("power") == "networkStandby"
-        desired = self._standby_interval if is_standby else self._normal_interval
-        if self.update_interval != desired:
-            self.update_interval = desired
-            _LOGGER.debug(
-                "Polling interval changed to %s s (%s)",
-                desired.total_seconds(),
-                "standby" if is_standby else "active",
-            )
+        if is_standby:
+            # Values may change while asleep (remote, app) — full read on wake-up
+            self._class_polled_at.clear()
+        else:
+            now = time.monotonic()
+            for name in due:
+                self._class_polled_at[name] = now
+            self._force_full_poll = False
+
+        self._apply_interval(is_standby)
 
-        # In standby skip heavy fetches (player data, eureka_info, dirac)
+        self._async_schedule_save(status)
+
+        # In standby skip heavy fetches (player data, dirac); the first
+        # stage of setup leaves them to _async_load_deferred
         if is_standby:
-            return status
+            return self._reconcile(status, ("power",), started)
+        if self._first_stage:
+            return self._reconcile(status, ("power", *keys), started)
 
-        # Fetch device info once (eureka_info from Google Cast API)
-        if self.device_info is None:
-            try:
-                self.device_info = await self.api.get_device_info()
-            except Exception:
-                _LOGGER.debug("Failed to fetch device info from port 8008")
+        await self._async_fetch_dirac_filters()
+        player = await self._async_fetch_player(status)
+        if player:
+            status["player"] = player
 
-        # Fetch Dirac filters once
-        if not self.dirac_filters:
-            try:
-                self.dirac_filters = await self.api.get_dirac_filters()
-            except Exception:
-                self.dirac_filters = []
+        return self._reconcile(status, ("power", *keys), started)
 
-        # Fetch player/media data
+    async def _async_fetch_device_info(self) -> bool:
+        """Fetch eureka_info once (Google Cast API). True if it was fetched now.
+
+        A restored copy is re-read to detect reboots and firmware updates.
+        """
+        if self._device_info_live:
+            return False
+        try:
+            info = await self.api.get_device_info()
+        except Exception:
+            info = None
+        if not info:
+            _LOGGER.debug("Failed to fetch device info from port 8008")
+            return False
+        self._check_device_identity(info)
+        self.device_info = info
+        self._device_info_live = True
+        return True
+
+    async def _async_fetch_dirac_filters(self) -> None:
+        """Fetch the Dirac filter catalog once."""
+        if self.dirac_filters:
+            return
+        try:
+            self.dirac_filters = await self.api.get_dirac_filters()
+        except Exception:
+            self.dirac_filters = []
+
+    async def _async_fetch_player(self, status: dict) -> dict | None:
+        """Player data for streaming inputs, or while the last payload was active.
+
+        On TV, HDMI and optical inputs player:player/data carries no metadata,
+        so the previous payload is kept without a request.
+        """
+        previous = (self.data or {}).get("player")
+        active = isinstance(previous, dict) and previous.get("state") in ("playing", "paused")
+        if status.get("input") not in STREAMING_INPUTS and not active:
+            return previous
         try:
             player = await self.api.get_player_data()
-            if player:
-                status["player"] = player
         except Exception:
             _LOGGER.debug("Failed to fetch player data")
+            return None
+        self._async_track_playback(player)
+        return player
+
+    @callback
+    def _async_track_playback(self, player: dict | None) -> None:
+        """Follow track progress and re-read the player shortly after the expected end.
 
-        return status
+        Elapsed time is counted from when playback of a track was first seen;
+        pauses stop the clock. With push updates the event queue reports the
+        next track, so no extra poll is scheduled.
+        """
+        if self._unsub_track_end is not None:
+            self._unsub_track_end()
+            self._unsub_track_end = None
+        player = player or {}
+        state = player.get("state")
+        title = player.get("trackRoles", {}).get("title")
+        now = time.monotonic()
+        if title != self._track_title:
+            self._track_title, self._track_elapsed = title, 0.0
+            self._track_resumed_at = now if state == "playing" else None
+        elif state == "playing" and self._track_resumed_at is None:
+            self._track_resumed_at = now
+        elif state != "playing" and self._track_resumed_at is not None:
+            self._track_elapsed += now - self._track_resumed_at
+            self._track_resumed_at = None
+
+        duration_ms = player.get("status", {}).get("duration")
+        if self.push_active or self._track_resumed_at is None or not duration_ms:
+            return
+        remaining = duration_ms / 1000 - self._track_elapsed - (now - self._track_resumed_at)
+        delay = remaining + PLAYER_TRACK_END_MARGIN
+        if 0 < delay < self.update_interval.total_seconds():
+            self._unsub_track_end = async_call_later(self.hass, delay, self._async_track_end)
+
+    async def _async_track_end(self, _now) -> None:
+        """Expected end of track: read the player only, not the whole status."""
+        self._unsub_track_end = None
+        data = self.data or {}
+        if not data.get("online") or data.get("power") == "networkStandby":
+            return
+        player = await self._async_fetch_player(data)
+        if player:
+            self._async_merge_update({**(self.data or {}), "player": player})
+
+    async def async_shutdown(self) -> None:
+        """Cancel the track-end, phase and confirmation timers along with the scheduled refresh."""
+        if self._unsub_track_end is not None:
+            self._unsub_track_end()
+            self._unsub_track_end = None
+        if self._unsub_phase is not None:
+            self._unsub_phase()
+            self._unsub_phase = None
+        if self._confirm_handle is not None:
+            self._confirm_handle.cancel()
+            self._confirm_handle = None
+        await super().async_shutdown()
+
+    # --- Staged first refresh ---
+
+    async def async_staged_first_refresh(self) -> None:
+        """First refresh in stages: setup waits only for the power probe and hot keys.
+
+        The other parameters with the Dirac catalog, eureka_info and player
+        data are loaded by async_start_deferred_load() once the platforms are
+        set up, and published as they arrive. Entities stay unavailable until
+        their key is present.
+        """
+        self._first_stage = True
+        try:
+            await self.async_config_entry_first_refresh()
+        finally:
+            self._first_stage = False
+        self._deferred_pending = True
 
     @callback
-    def async_request_delayed_refresh(self, delay: float = COMMAND_REFRESH_DELAY) -> None:
-        """Schedule a refresh after delay (non-blocking).
+    def async_start_deferred_load(self, entry: ConfigEntry, phase: float = 0) -> None:
+        """Load what setup left out in the background, and offset the poll timer by phase seconds.
 
-        Gives the soundbar time to process a command before we poll its state.
+        That is a full refresh after a restored snapshot, or the remaining
+        stages after a staged first refresh; it starts at once. Only the
+        regular polls wait for the fleet phase, so bars don't poll in step.
         """
-        self.hass.loop.call_later(
-            delay,
-            lambda: self.hass.async_create_task(self.async_request_refresh()),
+        if phase:
+            self._unsub_phase = async_call_later(self.hass, phase, self._async_apply_phase)
+        if not self._deferred_pending:
+            return
+        self._deferred_pending = False
+        entry.async_create_background_task(self.hass, self._async_load_deferred(entry), f"{self.name} deferred load")
+
+    @callback
+    def _async_apply_phase(self, _now) -> None:
+        """Restart the poll timer from now, so the next poll is one interval plus the phase after setup."""
+        self._unsub_phase = None
+        if self.data is not None:
+            self.async_set_updated_data(self.data)
+
+    async def _async_load_deferred(self, entry: ConfigEntry) -> None:
+        data = self.data or {}
+        if data.get("stale"):
+            await self.async_refresh()
+            return
+        if not data.get("online") or data.get("power") == "networkStandby":
+            # The regular poll reads everything once the bar is on
+            return
+
+        # Stage 2: warm and cold parameters, together with the Dirac catalog.
+        # Undemanded keys are read this once, so attributes and snapshots start complete.
+        # Stage 3, eureka_info, runs alongside on the Cast server (port 8008)
+        # and fills in the device registry entry
+        started = self._write_seq
+        rest = [name for name in POLL_CLASSES if name not in self._class_polled_at]
+        keys = [key for name in rest for key in POLL_CLASSES[name]]
+        status, info_fetched = await asyncio.gather(
+            self.api.get_status(keys), self._async_fetch_device_info(), return_exceptions=True
         )
+        if info_fetched is True:
+            self._async_update_device_registry(entry)
+        if isinstance(status, BaseException):
+            return
+        if not status.get("online") or status.get("power") == "networkStandby":
+            return
+        now = time.monotonic()
+        for name in rest:
+            self._class_polled_at[name] = now
+        await self._async_fetch_dirac_filters()
+        # Merged without restarting the poll timer: that keeps the fleet phase
+        self._async_merge_update(self._reconcile({**(self.data or {}), **status}, ("power", *keys), started))
+
+        # Stage 4: now playing
+        if player := await self._async_fetch_player(self.data or {}):
+            self._async_merge_update({**(self.data or {}), "player": player})
+
+    @callback
+    def _async_update_device_registry(self, entry: ConfigEntry) -> None:
+        """Add name, firmware and MAC from eureka_info to an existing device."""
+        registry = dr.async_get(self.hass)
+        device = registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+        info = self.device_info or {}
+        if device is None:
+            return
+        changes: dict = {}
+        if info.get("name"):
+            changes["name"] = info["name"]
+        if info.get("cast_build_revision"):
+            changes["sw_version"] = info["cast_build_revision"]
+        if info.get("mac_address"):
+            changes["merge_connections"] = {(dr.CONNECTION_NETWORK_MAC, info["mac_address"].lower())}
+        if changes:
+            registry.async_update_device(device.id, **changes)
+
+    def _apply_interval(self, is_standby: bool) -> None:
+        """Adaptive polling interval: slow in standby, slowest while push is active."""
+        if self.push_active:
+            desired = max(self._push_interval, self._standby_interval)
+            reason = "push"
+        elif is_standby:
+            desired, reason = self._standby_interval, "standby"
+        else:
+            desired, reason = self._normal_interval, "active"
+        if self.update_interval != desired:
+            self.update_interval = desired
+            _LOGGER.debug("Polling interval changed to %s s (%s)", desired.total_seconds(), reason)
+
+    # --- Push updates (device event queue) ---
+
+    @callback
+    def async_start_push(self, entry: ConfigEntry) -> None:
+        """Listen to the device event queue for the lifetime of the entry."""
+        entry.async_create_background_task(self.hass, self._async_event_loop(), f"{self.name} event queue")
+
+    async def _async_event_loop(self) -> None:
+        paths = self.api.event_paths()
+        while True:
+            try:
+                queue_id = await self.api.subscribe_events(paths)
+            except EventsNotSupportedError as err:
+                _LOGGER.debug("No event queue on device (%s), staying on polling", err)
+                return
+            except Exception as err:
+                _LOGGER.debug("Event queue subscription failed: %s", err)
+                await asyncio.sleep(EVENT_RESUBSCRIBE_DELAY)
+                continue
+
+            self._set_push_active(True)
+            try:
+                delay = 0.0
+                while True:
+                    started = self.hass.loop.time()
+                    events = await self.api.poll_events(queue_id)
+                    if events:
+                        self._async_handle_events(events)
+                    if self.hass.loop.time() - started >= EVENT_POLL_MIN_INTERVAL:
+                        delay = 0.0  # held open as intended
+                        continue
+                    # Answered at once: pace the requests instead of spinning against
+                    # the single-threaded bar, backing off while nothing happens
+                    if events:
+                        delay = EVENT_POLL_MIN_INTERVAL
+                    else:
+                        delay = min(max(delay * 2, EVENT_POLL_MIN_INTERVAL), EVENT_POLL_MAX_BACKOFF)
+                    await asyncio.sleep(delay)
+            except Exception as err:
+                _LOGGER.debug("Event queue lost (%s), falling back to polling", err)
+                self._set_push_active(False)
+                # The scheduled poll may be minutes away — catch up now
+                await self.async_request_refresh()
+            finally:
+                self._set_push_active(False)
+            await asyncio.sleep(EVENT_RESUBSCRIBE_DELAY)
+
+    @callback
+    def _set_push_active(self, active: bool) -> None:
+        if self.push_active == active:
+            return
+        self.push_active = active
+        data = self.data or {}
+        self._apply_interval(data.get("power") == "networkStandby")
+
+    @callback
+    def _async_handle_events(self, events: list[dict]) -> None:
+        """Merge event queue changes into the current status."""
+        changes = self.api.parse_events(events)
+        data = self.data or {}
+        if not changes:
+            return
+        if not data.get("online") or changes.get("power", data.get("power")) != data.get("power"):
+            # Came online or woke up / went to sleep — re-read everything
+            self._force_full_poll = True
+            self.hass.async_create_task(self.async_request_refresh())
+            if not data.get("online"):
+                return
+        # An event may predate our last write: it only confirms, never reverts
+        self._async_merge_update(self._reconcile({**data, **changes}, changes, None))
+
+    async def async_apply_profile(self, profile: dict) -> list[str]:
+        """Apply a sound profile (status key → value), writing only what differs.
+
+        The written values are shown at once and confirmed by a single refresh,
+        also when a later write fails partway through. Returns the keys written.
+        """
+        data = self.data or {}
+        if not data.get("online") or data.get("power") == "networkStandby":
+            raise HomeAssistantError("The soundbar is off or unreachable")
+        await self._async_read_unpolled(profile)
+        data = self.data or {}
+        written: list[str] = []
+        try:
+            await self.api.apply_profile(profile, data, written)
+        finally:
+            if written:
+                self.async_set_optimistic(**{key: profile[key] for key in written})
+                self.async_request_delayed_refresh()
+        return written
+
+    @callback
+    def async_set_optimistic(self, **changes: Any) -> None:
+        """Show acknowledged written values before the device confirms them.
+
+        The values go into the write overlay, so a poll that was already
+        running can't put the old values back (see _reconcile). data is
+        replaced, not mutated: a new status snapshot is built and only
+        listeners of the changed keys are notified.
+        """
+        if not self.data:
+            return
+        self._write_seq += 1
+        deadline = self.hass.loop.time() + OPTIMISTIC_WRITE_TTL
+        for key, value in changes.items():
+            self._pending_writes[key] = _PendingWrite(value, self._write_seq, deadline)
+        self.data = {**self.data, **changes}
+        self.async_update_listeners()
+
+    def _reconcile(self, data: dict, read: Collection[str], started: int | None) -> dict:
+        """Lay the write overlay over data from the device.
+
+        read holds the keys actually read; started is the write sequence
+        number when the read began (None for events, whose age is unknown).
+        A read that began after a write was acknowledged settles it: the
+        value read stands and the entry is dropped. Any older value of a
+        pending key is replaced by the written one until the entry expires.
+        """
+        if not self._pending_writes:
+            return data
+        now = self.hass.loop.time()
+        overlay = {}
+        for key, pending in list(self._pending_writes.items()):
+            if key in read and ((started is not None and pending.seq <= started) or data.get(key) == pending.value):
+                del self._pending_writes[key]  # confirmed, or changed on the device since
+            elif pending.deadline <= now:
+                del self._pending_writes[key]
+            else:
+                overlay[key] = pending.value
+        return {**data, **overlay} if overlay else data
+
+    async def async_take_snapshot(self, name: str) -> dict:
+        """Store the current audio state under name, from the last poll.
+
+        Only keys outside regular polling are read first.
+        """
+        data = self.data or {}
+        if not data.get("online") or data.get("power") == "networkStandby":
+            raise HomeAssistantError("The soundbar is off or unreachable")
+        await self._async_read_unpolled(PROFILE_WRITE_ORDER)
+        data = self.data or {}
+        snapshot = {key: data[key] for key in PROFILE_WRITE_ORDER if key in data}
+        self.snapshots[name] = snapshot
+        return snapshot
+
+    async def async_restore_snapshot(self, name: str) -> list[str]:
+        """Put back the state saved under name, writing only what changed since."""
+        if name not in self.snapshots:
+            raise ServiceValidationError(f"No snapshot named {name!r}")
+        return await self.async_apply_profile(self.snapshots[name])
+
+    @callback
+    def async_request_delayed_refresh(self, delay: float = COMMAND_REFRESH_DELAY) -> None:
+        """Confirm recent commands after delay (non-blocking).
+
+        Gives the soundbar time to process a command before we read its state.
+        Only the keys the commands can have changed are re-read (see
+        Param.affects); a power change re-reads everything. Commands in
+        quick succession (volume held down) push the pending confirmation
+        back and are confirmed together.
+        """
+        self.refresh_counts["requested"] += 1
+        now = self.hass.loop.time()
+        self._last_command_at = now
+        due = now + delay
+        if self._confirm_handle is not None:
+            self.refresh_counts["coalesced"] += 1
+            self._confirm_handle.cancel()
+            due = max(due, self._confirm_due)
+        self._confirm_due = due
+        self._confirm_handle = self.hass.loop.call_at(due, self._async_confirm_due)
+
+    @callback
+    def _async_confirm_due(self) -> None:
+        self._confirm_handle = None
+        self.hass.async_create_task(self._async_confirm_writes())
+
+    async def _async_confirm_writes(self) -> None:
+        affected = self.api.take_affected()
+        if not affected:
+            return  # confirmed together with an earlier command
+        if (inflight := self._refresh_inflight) is not None:
+            # A poll started after the last command reads the new values anyway
+            covered = self._refresh_started_at > self._last_command_at and affected <= self._refresh_keys
+            with contextlib.suppress(Exception):
+                await asyncio.shield(inflight)
+            if covered:
+                self.refresh_counts["coalesced"] += 1
+                return
+        data = self.data or {}
+        if "power" in affected or not data.get("online"):
+            self._force_full_poll = True
+            _REQUEST_COUNTED.set(True)  # this task only: counted when the command asked
+            await self.async_refresh()
+            return
+        self.refresh_counts["executed"] += 1
+        started = self._write_seq
+        try:
+            values = await self.api.read_keys(affected)
+        except Exception:
+            _LOGGER.debug("Failed to confirm %s", ", ".join(sorted(affected)))
+            values = {}
+        if "player" in affected and (player := await self._async_fetch_player({**data, **values})):
+            values["player"] = player
+        if values:
+            self._async_merge_update(self._reconcile({**(self.data or {}), **values}, values, started))
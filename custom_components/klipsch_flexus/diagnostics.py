@@ -9,8 +9,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import DOMAIN, FLEET_KEY
 from .coordinator import KlipschCoordinator
+from .schema import PARAMS
 
 TO_REDACT = {CONF_HOST}
 
@@ -19,6 +20,7 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
     """Return diagnostics for a config entry."""
     coordinator: KlipschCoordinator = hass.data[DOMAIN][entry.entry_id]
     api = coordinator.api
+    fleet = hass.data[DOMAIN].get(FLEET_KEY)
 
     return {
         "entry": {
@@ -26,10 +28,28 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
             "options": dict(entry.options),
         },
         "device_status": coordinator.data or {},
+        # Parameters the device has not answered for yet
+        "unread_params": sorted(key for key in PARAMS if key not in (coordinator.data or {})),
+        # Parameters some entity or service demands; the others are read on demand
+        "polled_params": coordinator.polled_params,
         "dirac_filters": coordinator.dirac_filters,
+        "push_active": coordinator.push_active,
+        "refreshes": dict(coordinator.refresh_counts),
+        "circuit_breaker": {
+            "state": coordinator.breaker_state,
+            "retry_in_s": round(api.breaker.retry_in, 1),
+        },
         "api_stats": {
             "last_response_time_ms": api.last_response_time,
             "total_requests": api.total_requests,
             "failed_requests": api.failed_requests,
+            "latency": api.latency.as_dict(),
+            "by_operation": api.metrics.by_operation(),
+            "by_path": api.metrics.as_dict(),
+        },
+        "cast_stats": {
+            "by_operation": api.cast_metrics.by_operation(),
+            "by_path": api.cast_metrics.as_dict(),
         },
+        "fleet": fleet.as_dict() if fleet else None,
     }
@@ -0,0 +1,117 @@
+"""Domain-wide request scheduling across all configured soundbars."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+from .const import FLEET_MAX_CONCURRENT, FLEET_RATE_WINDOW
+
+# Spreads any number of devices evenly over the poll interval without
+# moving the ones already placed (golden-ratio sequence)
+_PHASE_STEP = 0.6180339887
+
+
+class FleetScheduler:
+    """Shared by every KlipschAPI of the integration (hass.data[DOMAIN][FLEET_KEY]).
+
+    Gives each device its own poll phase, caps the number of requests in
+    flight across all devices and reports the fleet-wide request rate.
+    The cap is the lowest limit any registered device asks for (an entry
+    option), so it follows the devices as they come and go.
+    """
+
+    def __init__(self, max_concurrent: int = FLEET_MAX_CONCURRENT) -> None:
+        self._default_limit = max_concurrent
+        self._limits: dict[str, int] = {}  # entry_id → requested cap
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._phases: dict[str, int] = {}  # entry_id → phase index
+        self._started: deque[float] = deque()  # request start times within the rate window
+        self.in_flight = 0
+
+    @property
+    def devices(self) -> int:
+        return len(self._phases)
+
+    @property
+    def max_concurrent(self) -> int:
+        return min(self._limits.values(), default=self._default_limit)
+
+    def register(self, entry_id: str, interval: float, max_concurrent: int | None = None) -> float:
+        """Register a device; return its poll phase offset in seconds (0 ≤ offset < interval).
+
+        max_concurrent is the device's limit for requests in flight fleet-wide.
+        """
+        if max_concurrent is not None:
+            self._limits[entry_id] = max_concurrent
+            self._wake()  # the cap may have risen
+        index = self._phases.get(entry_id)
+        if index is None:
+            used = set(self._phases.values())
+            index = next(i for i in range(len(used) + 1) if i not in used)
+            self._phases[entry_id] = index
+        return (index * _PHASE_STEP) % 1 * interval
+
+    def unregister(self, entry_id: str) -> None:
+        self._phases.pop(entry_id, None)
+        if self._limits.pop(entry_id, None) is not None:
+            self._wake()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the fleet-wide request slots for one HTTP request."""
+        while self.in_flight >= self.max_concurrent:
+            fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    self._wake()  # pass on the wake-up we were given
+                raise
+            finally:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(fut)
+        self.in_flight += 1
+        now = time.monotonic()
+        self._started.append(now)
+        self._trim(now)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        """Let waiting requests re-check the cap, as many as there are free slots."""
+        free = self.max_concurrent - self.in_flight
+        for fut in self._waiters:
+            if free <= 0:
+                return
+            if not fut.done():
+                fut.set_result(None)
+            if not fut.cancelled():
+                free -= 1  # woken earlier or now, about to take a slot
+
+    def _trim(self, now: float) -> None:
+        """Forget request starts older than the rate window."""
+        cutoff = now - FLEET_RATE_WINDOW
+        while self._started and self._started[0] < cutoff:
+            self._started.popleft()
+
+    def request_rate(self) -> float:
+        """Requests per second across all devices over the last FLEET_RATE_WINDOW seconds."""
+        self._trim(time.monotonic())
+        return round(len(self._started) / FLEET_RATE_WINDOW, 2)
+
+    def as_dict(self) -> dict:
+        """Summary for diagnostics."""
+        return {
+            "devices": self.devices,
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "requests_per_s": self.request_rate(),
+        }
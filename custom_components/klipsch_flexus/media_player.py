@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
+import voluptuous as vol
 from homeassistant.components.media_player import (
     MediaPlayerEntity,
     MediaPlayerEntityFeature,
@@ -12,11 +13,27 @@ from homeassistant.components.media_player import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SOUND_MODES, SOURCES, SOURCES_REVERSE
+from .const import (
+    CHANNEL_LEVELS,
+    DIALOG_MODES,
+    DOMAIN,
+    EQ_PRESETS,
+    NIGHT_MODES,
+    SERVICE_APPLY_PROFILE,
+    SERVICE_RESTORE,
+    SERVICE_SNAPSHOT,
+    SOUND_MODES,
+    SOURCES,
+    SOURCES_REVERSE,
+)
 from .coordinator import KlipschCoordinator
+from .schema import PARAMS
 
 _BASE_FEATURES = (
     MediaPlayerEntityFeature.VOLUME_SET
@@ -29,10 +46,39 @@ _BASE_FEATURES = (
 )
 
 
+# apply_profile fields; channel levels use their status keys
+APPLY_PROFILE_SCHEMA = {
+    vol.Optional("source"): vol.In(list(SOURCES.values())),
+    vol.Optional("sound_mode"): vol.In(SOUND_MODES),
+    vol.Optional("eq_preset"): vol.In(EQ_PRESETS),
+    vol.Optional("dirac"): cv.string,
+    **{
+        vol.Optional(key): vol.All(vol.Coerce(int), vol.Range(min=PARAMS[key].min, max=PARAMS[key].max))
+        for key, _icon in CHANNEL_LEVELS
+    },
+    vol.Optional("night_mode"): vol.In(NIGHT_MODES),
+    vol.Optional("dialog_mode"): vol.In(DIALOG_MODES),
+}
+
+SNAPSHOT_SCHEMA = {vol.Optional("name", default="default"): cv.string}
+
+# Status keys shown as state attributes
+_ATTRIBUTE_PARAMS = {key: param for key, param in PARAMS.items() if param.attribute}
+
+# Status keys the media player keeps polled. Tone and channel levels are shown
+# as attributes too, but stay polled only while their number entities are enabled.
+_DEMANDED_KEYS = ("volume", "muted", "input", "mode", "dirac", "night_mode", "dialog_mode", "decoder", "eq_preset")
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator: KlipschCoordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_entities([KlipschMediaPlayer(coordinator, entry)])
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(SERVICE_APPLY_PROFILE, APPLY_PROFILE_SCHEMA, "async_apply_profile")
+    platform.async_register_entity_service(SERVICE_SNAPSHOT, SNAPSHOT_SCHEMA, "async_snapshot")
+    platform.async_register_entity_service(SERVICE_RESTORE, SNAPSHOT_SCHEMA, "async_restore_snapshot")
+
 
 class KlipschMediaPlayer(CoordinatorEntity[KlipschCoordinator], MediaPlayerEntity):
     """Klipsch Flexus media player."""
@@ -71,33 +117,28 @@ class KlipschMediaPlayer(CoordinatorEntity[KlipschCoordinator], MediaPlayerEntit
         self._prev_player_state: str | None = None
         self._prev_track_title: str | None = None
 
-    def _player_data(self) -> dict:
-        data = self.coordinator.data or {}
-        return data.get("player", {})
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_demand(_DEMANDED_KEYS))
 
     def _dirac_filter_name(self) -> str:
         """Resolve Dirac filter ID to human name."""
-        data = self.coordinator.data or {}
-        dirac_id = data.get("dirac", -1)
+        dirac_id = self.coordinator.status.dirac
+        if dirac_id is None:
+            dirac_id = -1
         for f in self.coordinator.dirac_filters:
             if f["id"] == dirac_id:
                 return f["name"]
         return "off" if dirac_id == -1 else str(dirac_id)
 
-    def _source_app_name(self) -> str | None:
-        """Get source app name from player metadata."""
-        player = self._player_data()
-        meta = player.get("trackRoles", {}).get("mediaData", {}).get("metaData", {})
-        return meta.get("externalAppName")
-
     # --- Media position tracking ---
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Track media position based on playback state transitions."""
-        player = self._player_data()
-        state = player.get("state")
-        title = player.get("trackRoles", {}).get("title")
+        player = self.coordinator.status.player
+        state = player.state
+        title = player.title
         now = datetime.now(UTC)
 
         if state == "playing":
@@ -119,160 +160,110 @@ class KlipschMediaPlayer(CoordinatorEntity[KlipschCoordinator], MediaPlayerEntit
         self._prev_track_title = title
         super()._handle_coordinator_update()
 
-    # --- Optimistic update helper ---
-
-    def _optimistic_update(self, **kwargs) -> None:
-        """Update coordinator data in-memory and push state to all entities."""
-        if self.coordinator.data:
-            self.coordinator.data.update(kwargs)
-            self.coordinator.async_set_updated_data(self.coordinator.data)
-
     @property
     def supported_features(self) -> MediaPlayerEntityFeature:
         features = _BASE_FEATURES
-        player = self._player_data()
-        controls = player.get("controls", {})
-        if controls.get("pause"):
+        player = self.coordinator.status.player
+        if player.can_pause:
             features |= MediaPlayerEntityFeature.PLAY | MediaPlayerEntityFeature.PAUSE
-        if controls.get("next_"):
+        if player.can_next:
             features |= MediaPlayerEntityFeature.NEXT_TRACK
-        if controls.get("previous"):
+        if player.can_previous:
             features |= MediaPlayerEntityFeature.PREVIOUS_TRACK
         return features
 
     @property
     def state(self) -> MediaPlayerState:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return MediaPlayerState.OFF
-        power = data.get("power", "unknown")
-        if power == "networkStandby":
+        if status.is_standby:
             return MediaPlayerState.STANDBY
-        player = self._player_data()
-        player_state = player.get("state")
-        if player_state == "playing":
+        if status.player.state == "playing":
             return MediaPlayerState.PLAYING
-        if player_state == "paused":
+        if status.player.state == "paused":
             return MediaPlayerState.PAUSED
         return MediaPlayerState.IDLE
 
     @property
     def volume_level(self) -> float | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("volume", 0) / 100.0
+        return (status.volume or 0) / 100.0
 
     @property
     def is_volume_muted(self) -> bool | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("muted", False)
+        return bool(status.muted)
 
     @property
     def source(self) -> str | None:
-        data = self.coordinator.data or {}
-        raw = data.get("input", "unknown")
+        raw = self.coordinator.status.input or "unknown"
         return SOURCES.get(raw, raw)
 
     @property
     def sound_mode(self) -> str | None:
-        data = self.coordinator.data or {}
-        return data.get("mode")
+        return self.coordinator.status.mode
 
     @property
     def media_content_type(self) -> MediaType | None:
-        player = self._player_data()
-        if player.get("state") in ("playing", "paused"):
+        if self.coordinator.status.player.active:
             return MediaType.MUSIC
         return None
 
     @property
     def media_title(self) -> str | None:
-        player = self._player_data()
-        track = player.get("trackRoles", {})
-        return track.get("title")
+        return self.coordinator.status.player.title
 
     @property
     def media_artist(self) -> str | None:
-        player = self._player_data()
-        meta = player.get("trackRoles", {}).get("mediaData", {}).get("metaData", {})
-        return meta.get("artist")
+        return self.coordinator.status.player.artist
 
     @property
     def media_album_name(self) -> str | None:
-        player = self._player_data()
-        meta = player.get("trackRoles", {}).get("mediaData", {}).get("metaData", {})
-        return meta.get("album")
+        return self.coordinator.status.player.album
 
     @property
     def media_image_url(self) -> str | None:
-        player = self._player_data()
-        track = player.get("trackRoles", {})
-        return track.get("icon")
+        return self.coordinator.status.player.image_url
 
     @property
     def media_duration(self) -> int | None:
-        player = self._player_data()
-        status = player.get("status", {})
-        duration_ms = status.get("duration")
-        if duration_ms is not None:
-            return duration_ms // 1000
-        return None
+        return self.coordinator.status.player.duration
 
     @property
     def media_position(self) -> int | None:
-        player = self._player_data()
-        if player.get("state") in ("playing", "paused"):
+        if self.coordinator.status.player.active:
             return self._position
         return None
 
     @property
     def media_position_updated_at(self) -> datetime | None:
-        player = self._player_data()
-        if player.get("state") in ("playing", "paused"):
+        if self.coordinator.status.player.active:
             return self._position_updated_at
         return None
 
     @property
     def app_name(self) -> str | None:
-        player = self._player_data()
-        media_roles = player.get("mediaRoles", {})
-        return media_roles.get("title")
+        return self.coordinator.status.player.app_name
 
     @property
     def extra_state_attributes(self) -> dict:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return {}
-        attrs = {
-            # Audio processing
-            "decoder": data.get("decoder", "unknown"),
-            "eq_preset": data.get("eq_preset", "unknown"),
-            "night_mode": data.get("night_mode", "off"),
-            "dialog_mode": data.get("dialog_mode", "off"),
-            # Surround channels
-            "back_height": data.get("back_height", 0),
-            "back_left": data.get("back_left", 0),
-            "back_right": data.get("back_right", 0),
-            "front_height": data.get("front_height", 0),
-            "side_left": data.get("side_left", 0),
-            "side_right": data.get("side_right", 0),
-            # Subwoofers
-            "sub_wireless_1": data.get("sub_wired", 0),
-            "sub_wireless_2": data.get("sub_wireless", 0),
-            # Tone
-            "bass": data.get("bass", 0),
-            "mid": data.get("mid", 0),
-            "treble": data.get("treble", 0),
-            # Dirac
-            "dirac_filter": self._dirac_filter_name(),
-        }
+        # Audio processing, channel levels and tone (see Param.attribute)
+        attrs = {}
+        for key, param in _ATTRIBUTE_PARAMS.items():
+            value = getattr(status, key)
+            attrs[param.attribute] = param.default if value is None else value
+        attrs["dirac_filter"] = self._dirac_filter_name()
         # Source app (only when available)
-        source_app = self._source_app_name()
-        if source_app:
-            attrs["source_app"] = source_app
+        if status.player.source_app:
+            attrs["source_app"] = status.player.source_app
         return attrs
 
     # --- Commands with optimistic updates ---
@@ -280,39 +271,37 @@ class KlipschMediaPlayer(CoordinatorEntity[KlipschCoordinator], MediaPlayerEntit
     async def async_set_volume_level(self, volume: float) -> None:
         level = round(volume * 100)
         await self.coordinator.api.set_volume(level)
-        self._optimistic_update(volume=level)
+        self.coordinator.async_set_optimistic(volume=level)
         self.coordinator.async_request_delayed_refresh()
 
     async def async_volume_up(self) -> None:
-        data = self.coordinator.data or {}
-        current = data.get("volume", 0)
+        current = self.coordinator.status.volume or 0
         new_level = min(current + 5, 100)
         await self.coordinator.api.set_volume(new_level)
-        self._optimistic_update(volume=new_level)
+        self.coordinator.async_set_optimistic(volume=new_level)
         self.coordinator.async_request_delayed_refresh()
 
     async def async_volume_down(self) -> None:
-        data = self.coordinator.data or {}
-        current = data.get("volume", 0)
+        current = self.coordinator.status.volume or 0
         new_level = max(current - 5, 0)
         await self.coordinator.api.set_volume(new_level)
-        self._optimistic_update(volume=new_level)
+        self.coordinator.async_set_optimistic(volume=new_level)
         self.coordinator.async_request_delayed_refresh()
 
     async def async_mute_volume(self, mute: bool) -> None:
         await self.coordinator.api.set_mute(mute)
-        self._optimistic_update(muted=mute)
+        self.coordinator.async_set_optimistic(muted=mute)
         self.coordinator.async_request_delayed_refresh()
 
     async def async_select_source(self, source: str) -> None:
         raw = SOURCES_REVERSE.get(source, source)
         await self.coordinator.api.set_input(raw)
-        self._optimistic_update(input=raw)
+        self.coordinator.async_set_optimistic(input=raw)
         self.coordinator.async_request_delayed_refresh()
 
     async def async_select_sound_mode(self, sound_mode: str) -> None:
         await self.coordinator.api.set_sound_mode(sound_mode)
-        self._optimistic_update(mode=sound_mode)
+        self.coordinator.async_set_optimistic(mode=sound_mode)
         self.coordinator.async_request_delayed_refresh()
 
     async def async_media_play(self) -> None:
@@ -331,12 +320,34 @@ class KlipschMediaPlayer(CoordinatorEntity[KlipschCoordinator], MediaPlayerEntit
         await self.coordinator.api.media_control("previous")
         self.coordinator.async_request_delayed_refresh()
 
+    async def async_apply_profile(self, **fields) -> None:
+        """Switch to a sound profile, sending only the settings that differ."""
+        profile = {key: value for key, value in fields.items() if key not in ("source", "sound_mode", "dirac")}
+        if "source" in fields:
+            profile["input"] = SOURCES_REVERSE[fields["source"]]
+        if "sound_mode" in fields:
+            profile["mode"] = fields["sound_mode"]
+        if "dirac" in fields:
+            filters = {f["name"]: f["id"] for f in self.coordinator.dirac_filters}
+            if fields["dirac"] not in filters:
+                raise ServiceValidationError(f"Unknown Dirac filter: {fields['dirac']}")
+            profile["dirac"] = filters[fields["dirac"]]
+        await self.coordinator.async_apply_profile(profile)
+
+    async def async_snapshot(self, name: str) -> None:
+        """Remember the current audio state under name."""
+        await self.coordinator.async_take_snapshot(name)
+
+    async def async_restore_snapshot(self, name: str) -> None:
+        """Return to a remembered audio state, sending only what changed."""
+        await self.coordinator.async_restore_snapshot(name)
+
     async def async_turn_on(self) -> None:
         await self.coordinator.api.set_power("online")
-        self._optimistic_update(power="online")
+        self.coordinator.async_set_optimistic(power="online")
         self.coordinator.async_request_delayed_refresh(delay=3.0)
 
     async def async_turn_off(self) -> None:
         await self.coordinator.api.set_power("networkStandby")
-        self._optimistic_update(power="networkStandby")
+        self.coordinator.async_set_optimistic(power="networkStandby")
         self.coordinator.async_request_delayed_refresh(delay=3.0)
@@ -0,0 +1,194 @@
+"""Request latency statistics for Klipsch Flexus."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+
+from .const import (
+    LATENCY_BUCKETS_MS,
+    TIMEOUT_EWMA_ALPHA,
+    TIMEOUT_EWMA_FACTOR,
+    TIMEOUT_FLOOR,
+    TIMEOUT_MIN_SAMPLES,
+    TIMEOUT_P99_FACTOR,
+    TIMEOUT_SAMPLE_WINDOW,
+)
+
+
+class PathLatency:
+    """Response times of one request kind: EWMA plus a window of recent samples."""
+
+    __slots__ = ("ewma", "samples")
+
+    def __init__(self) -> None:
+        self.ewma: float | None = None
+        self.samples: deque[float] = deque(maxlen=TIMEOUT_SAMPLE_WINDOW)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        if self.ewma is None:
+            self.ewma = seconds
+        else:
+            self.ewma += TIMEOUT_EWMA_ALPHA * (seconds - self.ewma)
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LatencyTracker:
+    """Latency statistics per request kind (e.g. "getData player:volume").
+
+    Timeouts are derived from them so a dead request is given up on after
+    a few multiples of the normal response time, not after a fixed 8–10 s.
+    """
+
+    def __init__(self) -> None:
+        self._stats: dict[str, PathLatency] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        """Record a response time. Timed-out attempts record their timeout."""
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = PathLatency()
+        stats.record(seconds)
+
+    def timeout_for(self, key: str, ceiling: float, attempt: int = 0) -> float:
+        """Timeout for an attempt, learned from recent latency within [floor, ceiling].
+
+        The ceiling (the fixed API_TIMEOUT_* value) is used until enough samples
+        exist. Each retry doubles the learned timeout, so a device that is slow
+        but alive still gets through.
+        """
+        stats = self._stats.get(key)
+        if stats is None or stats.ewma is None or len(stats.samples) < TIMEOUT_MIN_SAMPLES:
+            return ceiling
+        learned = max(stats.ewma * TIMEOUT_EWMA_FACTOR, stats.percentile(0.99) * TIMEOUT_P99_FACTOR)
+        return min(max(learned * 2**attempt, TIMEOUT_FLOOR), ceiling)
+
+    def as_dict(self) -> dict[str, dict]:
+        """Per-key summary for diagnostics (milliseconds)."""
+        return {
+            key: {
+                "ewma_ms": round(stats.ewma * 1000, 1),
+                "p95_ms": round(stats.percentile(0.95) * 1000, 1),
+                "samples": len(stats.samples),
+            }
+            for key, stats in self._stats.items()
+            if stats.ewma is not None
+        }
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with timeout and error counters."""
+
+    __slots__ = ("buckets", "count", "errors", "max_ms", "timeouts", "total_ms")
+
+    def __init__(self) -> None:
+        # One count per LATENCY_BUCKETS_MS bound, plus an overflow bucket
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.timeouts = 0
+        self.errors = 0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.timeouts += other.timeouts
+        self.errors += other.errors
+
+    def percentile(self, fraction: float) -> float | None:
+        """Upper bound (ms) of the bucket holding the given fraction of requests."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                # Overflow bucket and bounds above the slowest request report the max
+                return self.max_ms if i == len(LATENCY_BUCKETS_MS) else min(LATENCY_BUCKETS_MS[i], self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": _round(self.percentile(0.50)),
+            "p95_ms": _round(self.percentile(0.95)),
+            "p99_ms": _round(self.percentile(0.99)),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+
+class RequestMetrics:
+    """Latency histograms and failure counters per operation and path.
+
+    Operations are the endpoints of one service ("getData", "setData",
+    "getRows" on port 80; "eureka" on the Cast server). Every attempt is
+    counted, including retries.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+
+    def _get(self, operation: str, path: str) -> LatencyHistogram:
+        histogram = self._histograms.get((operation, path))
+        if histogram is None:
+            histogram = self._histograms[operation, path] = LatencyHistogram()
+        return histogram
+
+    def observe(self, operation: str, path: str, seconds: float) -> None:
+        """Record a completed request."""
+        self._get(operation, path).observe(seconds)
+
+    def timeout(self, operation: str, path: str) -> None:
+        self._get(operation, path).timeouts += 1
+
+    def error(self, operation: str, path: str) -> None:
+        self._get(operation, path).errors += 1
+
+    def by_operation(self) -> dict[str, dict]:
+        """Histograms summed over all paths of each operation."""
+        totals: dict[str, LatencyHistogram] = {}
+        for (operation, _path), histogram in self._histograms.items():
+            totals.setdefault(operation, LatencyHistogram()).merge(histogram)
+        return {operation: histogram.as_dict() for operation, histogram in sorted(totals.items())}
+
+    def slowest(self, limit: int = 5) -> dict[str, float]:
+        """p95 (ms) of the slowest paths, slowest first."""
+        ranked = sorted(
+            (
+                (f"{operation} {path}", histogram.percentile(0.95))
+                for (operation, path), histogram in self._histograms.items()
+            ),
+            key=lambda item: item[1] or 0,
+            reverse=True,
+        )
+        return {key: round(p95, 1) for key, p95 in ranked[:limit] if p95 is not None}
+
+    def as_dict(self) -> dict[str, dict]:
+        """Per path summary for diagnostics."""
+        return {
+            f"{operation} {path}": histogram.as_dict()
+            for (operation, path), histogram in sorted(self._histograms.items())
+        }
@@ -10,7 +10,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import CHANNEL_LEVELS, DOMAIN
-from .coordinator import KlipschCoordinator
+from .coordinator import KlipschCoordinator, status_keys
+from .schema import PARAMS
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
@@ -22,8 +23,6 @@ class KlipschChannelLevel(CoordinatorEntity[KlipschCoordinator], NumberEntity):
     """Channel level slider (bass/mid/treble/surround/subwoofer)."""
 
     _attr_has_entity_name = True
-    _attr_native_min_value = -6
-    _attr_native_max_value = 6
     _attr_native_step = 1
     _attr_mode = NumberMode.SLIDER
     _attr_entity_category = EntityCategory.CONFIG
@@ -35,9 +34,11 @@ class KlipschChannelLevel(CoordinatorEntity[KlipschCoordinator], NumberEntity):
         param: str,
         icon: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys(param))
         self._param = param
         self._attr_translation_key = param
+        self._attr_native_min_value = PARAMS[param].min
+        self._attr_native_max_value = PARAMS[param].max
         self._attr_icon = icon
         self._attr_unique_id = f"{entry.entry_id}_{param}"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
@@ -45,25 +46,24 @@ class KlipschChannelLevel(CoordinatorEntity[KlipschCoordinator], NumberEntity):
     @property
     def available(self) -> bool:
         """Unavailable when device is offline or in standby (can't control)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
-            return False
-        if data.get("power") == "networkStandby":
+        status = self.coordinator.status
+        if not status.available:
             return False
+        if getattr(status, self._param) is None:
+            return False  # not read yet
         return super().available
 
     @property
     def native_value(self) -> float | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get(self._param, 0)
+        value = getattr(status, self._param)
+        return 0 if value is None else value
 
     async def async_set_native_value(self, value: float) -> None:
         int_val = int(value)
         await self.coordinator.api.set_channel_level(self._param, int_val)
         # Optimistic update
-        if self.coordinator.data:
-            self.coordinator.data[self._param] = int_val
-            self.async_write_ha_state()
+        self.coordinator.async_set_optimistic(**{self._param: int_val})
         self.coordinator.async_request_delayed_refresh()
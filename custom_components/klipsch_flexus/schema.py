@@ -0,0 +1,142 @@
+"""Parameter schema — every status parameter of the soundbar, defined once.
+
+A Param ties a status key to its API path, value envelope, poll class, write
+dependencies and value range. The registry is built at import; the API client,
+coordinator, entities and diagnostics derive their tables from it instead of
+keeping their own.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+from urllib.parse import quote
+
+from .const import API_PATHS, NIGHT_MODE_FROM_API, NIGHT_MODE_TO_API
+
+# Poll classes in polling order — status keys grouped by how often they change.
+# Power is probed on every tick regardless; player data is fetched by the
+# coordinator. Intervals: POLL_CLASS_INTERVALS.
+POLL_CLASS_NAMES = ("hot", "warm", "cold")
+
+
+@dataclass(frozen=True, slots=True)
+class Param:
+    """One device parameter as read by getData and written by setData.
+
+    Values travel in an envelope {"type": wire_type, wire_type: value};
+    from_api / to_api translate device values that differ from status values.
+    """
+
+    key: str
+    path: str
+    wire_type: str
+    default: Any  # when the envelope lacks the value
+    poll_class: str
+    affects: tuple[str, ...] = ()  # status keys a write can change (default: key itself)
+    min: int | None = None
+    max: int | None = None
+    from_api: Mapping[str, str] | None = None
+    to_api: Mapping[str, str] | None = None
+    attribute: str | None = None  # media player state attribute, if shown there
+
+    def __post_init__(self) -> None:
+        if not self.affects:
+            object.__setattr__(self, "affects", (self.key,))
+
+    def parse(self, data: list) -> Any:
+        """Status value from a getData response (or a batched row / event, wrapped in a list)."""
+        value = data[0].get(self.wire_type, self.default)
+        if self.from_api is not None:
+            return self.from_api.get(value, self.default)
+        return value
+
+    def encode(self, value: Any) -> dict:
+        """setData envelope for a status value."""
+        if self.to_api is not None:
+            value = self.to_api.get(value, value)
+        return {"type": self.wire_type, self.wire_type: value}
+
+
+def _level(key: str, attribute: str | None = None) -> Param:
+    """Channel level or tone control in dB."""
+    return Param(key, API_PATHS[key], "i32_", 0, "cold", min=-6, max=6, attribute=attribute or key)
+
+
+PARAMS: Mapping[str, Param] = MappingProxyType(
+    {
+        param.key: param
+        for param in (
+            Param("volume", API_PATHS["volume"], "i32_", 0, "hot", min=0, max=100),
+            Param("muted", API_PATHS["mute"], "bool_", False, "hot"),
+            Param(
+                "input",
+                API_PATHS["input"],
+                "cinemaPhysicalAudioInput",
+                "unknown",
+                "hot",
+                affects=("input", "decoder", "player"),
+            ),
+            Param(
+                "mode",
+                API_PATHS["mode"],
+                "cinemaPostProcessorMode",
+                "unknown",
+                "warm",
+                affects=("mode", "night_mode", "dialog_mode"),
+            ),
+            Param(
+                "night_mode",
+                API_PATHS["night"],
+                "cinemaNightMode",
+                "off",
+                "warm",
+                from_api=NIGHT_MODE_FROM_API,
+                to_api=NIGHT_MODE_TO_API,
+                attribute="night_mode",
+            ),
+            Param("dialog_mode", API_PATHS["dialog"], "cinemaDialogMode", "off", "warm", attribute="dialog_mode"),
+            _level("bass"),
+            _level("mid"),
+            _level("treble"),
+            Param("decoder", API_PATHS["decoder"], "cinemaAudioDecoder", "unknown", "warm", attribute="decoder"),
+            Param(
+                "eq_preset",
+                API_PATHS["eq_preset"],
+                "cinemaEqPreset",
+                "unknown",
+                "cold",
+                affects=("eq_preset", "bass", "mid", "treble"),
+                attribute="eq_preset",
+            ),
+            Param("dirac", API_PATHS["dirac"], "i32_", -1, "cold"),
+            # Subwoofers (attribute names as numbered in the Klipsch app)
+            _level("sub_wired", "sub_wireless_1"),
+            _level("sub_wireless", "sub_wireless_2"),
+            # Surround channel levels (Dolby Atmos)
+            _level("back_height"),
+            _level("back_left"),
+            _level("back_right"),
+            _level("front_height"),
+            _level("side_left"),
+            _level("side_right"),
+        )
+    }
+)
+
+PARAMS_BY_PATH: Mapping[str, Param] = MappingProxyType({param.path: param for param in PARAMS.values()})
+
+POLL_CLASSES: Mapping[str, list[str]] = MappingProxyType(
+    {name: [key for key, param in PARAMS.items() if param.poll_class == name] for name in POLL_CLASS_NAMES}
+)
+
+# Every known path (status parameters, power, player, ...), URL-encoded once
+_QUERIES = {path: quote(path, safe=":/") for path in API_PATHS.values()}
+
+
+def path_query(path: str) -> str:
+    """URL-encoded path for getData/setData/getRows query strings."""
+    query = _QUERIES.get(path)
+    return query if query is not None else quote(path, safe=":/")
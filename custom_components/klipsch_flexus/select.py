@@ -15,7 +15,7 @@ from .const import (
     EQ_PRESETS,
     NIGHT_MODES,
 )
-from .coordinator import KlipschCoordinator
+from .coordinator import DIRAC_FILTERS_KEY, KlipschCoordinator, status_keys
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
@@ -38,7 +38,7 @@ class KlipschNightModeSelect(CoordinatorEntity[KlipschCoordinator], SelectEntity
     _attr_entity_category = EntityCategory.CONFIG
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys("night_mode"))
         self._attr_unique_id = f"{entry.entry_id}_night_mode"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
         self._attr_options = NIGHT_MODES
@@ -46,25 +46,23 @@ class KlipschNightModeSelect(CoordinatorEntity[KlipschCoordinator], SelectEntity
     @property
     def available(self) -> bool:
         """Unavailable when device is offline or in standby (can't control)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
-            return False
-        if data.get("power") == "networkStandby":
+        status = self.coordinator.status
+        if not status.available:
             return False
+        if status.night_mode is None:
+            return False  # not read yet
         return super().available
 
     @property
     def current_option(self) -> str | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("night_mode", "off")
+        return status.night_mode or "off"
 
     async def async_select_option(self, option: str) -> None:
         await self.coordinator.api.set_night_mode(option)
-        if self.coordinator.data:
-            self.coordinator.data["night_mode"] = option
-            self.async_write_ha_state()
+        self.coordinator.async_set_optimistic(night_mode=option)
         self.coordinator.async_request_delayed_refresh()
 
 
@@ -77,7 +75,7 @@ class KlipschDialogModeSelect(CoordinatorEntity[KlipschCoordinator], SelectEntit
     _attr_entity_category = EntityCategory.CONFIG
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys("dialog_mode"))
         self._attr_unique_id = f"{entry.entry_id}_dialog_mode"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
         self._attr_options = DIALOG_MODES
@@ -85,25 +83,23 @@ class KlipschDialogModeSelect(CoordinatorEntity[KlipschCoordinator], SelectEntit
     @property
     def available(self) -> bool:
         """Unavailable when device is offline or in standby (can't control)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
-            return False
-        if data.get("power") == "networkStandby":
+        status = self.coordinator.status
+        if not status.available:
             return False
+        if status.dialog_mode is None:
+            return False  # not read yet
         return super().available
 
     @property
     def current_option(self) -> str | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("dialog_mode", "off")
+        return status.dialog_mode or "off"
 
     async def async_select_option(self, option: str) -> None:
         await self.coordinator.api.set_dialog_mode(option)
-        if self.coordinator.data:
-            self.coordinator.data["dialog_mode"] = option
-            self.async_write_ha_state()
+        self.coordinator.async_set_optimistic(dialog_mode=option)
         self.coordinator.async_request_delayed_refresh()
 
 
@@ -116,7 +112,7 @@ class KlipschEqPresetSelect(CoordinatorEntity[KlipschCoordinator], SelectEntity)
     _attr_entity_category = EntityCategory.CONFIG
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys("eq_preset"))
         self._attr_unique_id = f"{entry.entry_id}_eq_preset"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
         self._attr_options = EQ_PRESETS
@@ -124,35 +120,33 @@ class KlipschEqPresetSelect(CoordinatorEntity[KlipschCoordinator], SelectEntity)
     @property
     def available(self) -> bool:
         """Unavailable when device is offline or in standby (can't control)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
-            return False
-        if data.get("power") == "networkStandby":
+        status = self.coordinator.status
+        if not status.available:
             return False
+        if status.eq_preset is None:
+            return False  # not read yet
         return super().available
 
     @property
     def available(self) -> bool:
         """Unavailable when device is offline or in standby (can't control)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
-            return False
-        if data.get("power") == "networkStandby":
+        status = self.coordinator.status
+        if not status.available:
             return False
+        if status.eq_preset is None:
+            return False  # not read yet
         return super().available
 
     @property
     def current_option(self) -> str | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("eq_preset", "flat")
+        return status.eq_preset or "flat"
 
     async def async_select_option(self, option: str) -> None:
         await self.coordinator.api.set_eq_preset(option)
-        if self.coordinator.data:
-            self.coordinator.data["eq_preset"] = option
-            self.async_write_ha_state()
+        self.coordinator.async_set_optimistic(eq_preset=option)
         self.coordinator.async_request_delayed_refresh()
 
 
@@ -165,7 +159,7 @@ class KlipschDiracSelect(CoordinatorEntity[KlipschCoordinator], SelectEntity):
     _attr_entity_category = EntityCategory.CONFIG
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys("dirac", DIRAC_FILTERS_KEY))
         self._attr_unique_id = f"{entry.entry_id}_dirac"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
         self._dirac_map: dict[str, int] = {}
@@ -186,27 +180,25 @@ class KlipschDiracSelect(CoordinatorEntity[KlipschCoordinator], SelectEntity):
     @property
     def available(self) -> bool:
         """Unavailable when device is offline or in standby (can't control)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
-            return False
-        if data.get("power") == "networkStandby":
+        status = self.coordinator.status
+        if not status.available:
             return False
+        if status.dirac is None:
+            return False  # not read yet
         return super().available
 
     @property
     def current_option(self) -> str | None:
         self._update_filter_options()
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        dirac_id = data.get("dirac", -1)
+        dirac_id = -1 if status.dirac is None else status.dirac
         return self._dirac_reverse.get(dirac_id, "off")
 
     async def async_select_option(self, option: str) -> None:
         filter_id = self._dirac_map.get(option, -1)
         await self.coordinator.api.set_dirac(filter_id)
         # Optimistic update
-        if self.coordinator.data:
-            self.coordinator.data["dirac"] = filter_id
-            self.async_write_ha_state()
+        self.coordinator.async_set_optimistic(dirac=filter_id)
         self.coordinator.async_request_delayed_refresh()
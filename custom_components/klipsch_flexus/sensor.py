@@ -10,7 +10,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, SOUND_MODES, SOURCES
-from .coordinator import KlipschCoordinator
+from .coordinator import KlipschCoordinator, status_keys
+from .status import NO_PLAYER
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
@@ -35,27 +36,37 @@ class KlipschResponseTimeSensor(CoordinatorEntity[KlipschCoordinator], SensorEnt
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_suggested_display_precision = 0
+    # Change with every poll — keep them out of the recorder
+    _unrecorded_attributes = frozenset({"latency", "refreshes", "slowest_paths"})
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys("poll_time_ms"))
         self._attr_unique_id = f"{entry.entry_id}_response_time"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
 
     @property
     def native_value(self) -> float | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("poll_time_ms")
+        return status.poll_time_ms
 
     @property
     def extra_state_attributes(self) -> dict:
         api = self.coordinator.api
-        return {
+        attrs = {
             "last_request_ms": api.last_response_time,
             "total_requests": api.total_requests,
             "failed_requests": api.failed_requests,
+            "circuit_breaker": self.coordinator.breaker_state,
+            # p50/p95/p99 per endpoint and the paths that make polls slow
+            "latency": api.metrics.by_operation(),
+            "slowest_paths": api.metrics.slowest(),
+            "refreshes": dict(self.coordinator.refresh_counts),
         }
+        if api.fleet is not None and api.fleet.devices > 1:
+            attrs["fleet_requests_per_s"] = api.fleet.request_rate()
+        return attrs
 
 
 class KlipschStatusSensor(CoordinatorEntity[KlipschCoordinator], SensorEntity):
@@ -69,35 +80,42 @@ class KlipschStatusSensor(CoordinatorEntity[KlipschCoordinator], SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, context=status_keys("decoder", "failed_params", "poll_time_ms", "player", "stale_params")
+        )
         self._attr_unique_id = f"{entry.entry_id}_status"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
 
     @property
     def native_value(self) -> str:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return "offline"
-        power = data.get("power", "unknown")
-        if power == "networkStandby":
+        if status.is_standby:
             return "standby"
         return "on"
 
     @property
     def extra_state_attributes(self) -> dict:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return {}
         attrs = {
-            "decoder": data.get("decoder", "unknown"),
-            "failed_params": data.get("failed_params", 0),
-            "poll_time_ms": data.get("poll_time_ms"),
+            "decoder": status.decoder or "unknown",
+            "failed_params": status.failed_params,
+            "poll_time_ms": status.poll_time_ms,
         }
+        if status.stale:
+            # Restored from the last session, or kept while only the Cast server answers
+            attrs["stale"] = True
+        if status.stale_params:
+            # Left unread by the poll time budget, read first next poll
+            attrs["stale_params"] = list(status.stale_params)
         # Player info if available
-        player = data.get("player")
-        if player and isinstance(player, dict):
-            attrs["media_title"] = player.get("title", "")
-            attrs["media_artist"] = player.get("artist", "")
+        player = status.player
+        if player is not NO_PLAYER:
+            attrs["media_title"] = player.title or ""
+            attrs["media_artist"] = player.artist or ""
         return attrs
 
 
@@ -112,29 +130,30 @@ class KlipschInputSensor(CoordinatorEntity[KlipschCoordinator], SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys("input"))
         self._attr_unique_id = f"{entry.entry_id}_active_input"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
 
     @property
     def available(self) -> bool:
         """Unavailable when device is offline (coordinator returned online=False)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return False
+        if status.input is None:
+            return False  # not read yet
         return super().available
 
     @property
     def native_value(self) -> str | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("input")
+        return status.input
 
     @property
     def extra_state_attributes(self) -> dict:
-        data = self.coordinator.data or {}
-        raw = data.get("input", "")
+        raw = self.coordinator.status.input or ""
         return {"display_name": SOURCES.get(raw, raw)}
 
 
@@ -149,21 +168,23 @@ class KlipschSoundModeSensor(CoordinatorEntity[KlipschCoordinator], SensorEntity
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(self, coordinator: KlipschCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=status_keys("mode"))
         self._attr_unique_id = f"{entry.entry_id}_active_sound_mode"
         self._attr_device_info = {"identifiers": {(DOMAIN, entry.entry_id)}}
 
     @property
     def available(self) -> bool:
         """Unavailable when device is offline (coordinator returned online=False)."""
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return False
+        if status.mode is None:
+            return False  # not read yet
         return super().available
 
     @property
     def native_value(self) -> str | None:
-        data = self.coordinator.data or {}
-        if not data.get("online"):
+        status = self.coordinator.status
+        if not status.online:
             return None
-        return data.get("mode")
+        return status.mode
@@ -0,0 +1,116 @@
+"""Immutable status snapshot for entities, built once per coordinator update."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .schema import PARAMS
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerInfo:
+    """Now-playing data, resolved from the nested player:player/data payload."""
+
+    state: str | None = None
+    active: bool = False  # playing or paused
+    title: str | None = None
+    artist: str | None = None
+    album: str | None = None
+    image_url: str | None = None
+    duration: int | None = None  # seconds
+    app_name: str | None = None  # playing app (mediaRoles)
+    source_app: str | None = None  # app that started the stream (metadata)
+    can_pause: bool = False
+    can_next: bool = False
+    can_previous: bool = False
+
+    @classmethod
+    def from_data(cls, player: Mapping[str, Any]) -> PlayerInfo:
+        track = player.get("trackRoles") or {}
+        meta = (track.get("mediaData") or {}).get("metaData") or {}
+        controls = player.get("controls") or {}
+        duration_ms = (player.get("status") or {}).get("duration")
+        state = player.get("state")
+        return cls(
+            state=state,
+            active=state in ("playing", "paused"),
+            title=track.get("title"),
+            artist=meta.get("artist"),
+            album=meta.get("album"),
+            image_url=track.get("icon"),
+            duration=duration_ms // 1000 if duration_ms is not None else None,
+            app_name=(player.get("mediaRoles") or {}).get("title"),
+            source_app=meta.get("externalAppName"),
+            can_pause=bool(controls.get("pause")),
+            can_next=bool(controls.get("next_")),
+            can_previous=bool(controls.get("previous")),
+        )
+
+
+NO_PLAYER = PlayerInfo()
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceStatus:
+    """Coordinator data as typed fields. Parameters not read yet are None.
+
+    Never changed after creation: updates (optimistic ones included) replace
+    coordinator.data, and KlipschCoordinator.status builds a new snapshot.
+    """
+
+    online: bool = False
+    power: str | None = None
+    is_standby: bool = False
+    available: bool = False  # online and awake: settings can be read and written
+    stale: bool = False  # restored from the last session, not yet confirmed
+    # Parameters (schema.PARAMS)
+    volume: int | None = None
+    muted: bool | None = None
+    input: str | None = None
+    mode: str | None = None
+    night_mode: str | None = None
+    dialog_mode: str | None = None
+    decoder: str | None = None
+    eq_preset: str | None = None
+    dirac: int | None = None
+    bass: int | None = None
+    mid: int | None = None
+    treble: int | None = None
+    sub_wired: int | None = None
+    sub_wireless: int | None = None
+    back_height: int | None = None
+    back_left: int | None = None
+    back_right: int | None = None
+    front_height: int | None = None
+    side_left: int | None = None
+    side_right: int | None = None
+    # Poll figures and media
+    poll_time_ms: int | None = None
+    failed_params: int = 0
+    stale_params: tuple[str, ...] = ()  # left unread by the poll time budget
+    player: PlayerInfo = NO_PLAYER
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, Any] | None) -> DeviceStatus:
+        if not data:
+            return OFFLINE
+        online = bool(data.get("online"))
+        is_standby = data.get("power") == "networkStandby"
+        player = data.get("player")
+        return cls(
+            online=online,
+            power=data.get("power"),
+            is_standby=is_standby,
+            available=online and not is_standby,
+            stale=bool(data.get("stale")),
+            poll_time_ms=data.get("poll_time_ms"),
+            failed_params=data.get("failed_params", 0),
+            stale_params=tuple(data.get("stale_params", ())),
+            player=PlayerInfo.from_data(player) if isinstance(player, dict) and player else NO_PLAYER,
+            **{key: data.get(key) for key in PARAMS},
+        )
+
+
+OFFLINE = DeviceStatus()
@@ -0,0 +1,298 @@
+"""Klipsch Flexus CORE 300 simulator for benchmarks and offline tests.
+
+A stand-in for the soundbar's native HTTP API (port 80) and the Google Cast
+eureka_info endpoint (port 8008), returning the same JSON shapes KlipschAPI
+parses. Like the real device each server handles one request at a time (the
+two independently), adds a configurable per-request latency and stalls for
+seconds in networkStandby.
+
+Usage:
+  python -m tests.simulator --port 8080 --cast-port 8008 --latency 0.3
+  python -m tests.simulator --standby --standby-latency 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import json
+import time
+
+from aiohttp import web
+
+from custom_components.klipsch_flexus.const import API_PATHS
+
+STANDBY = "networkStandby"
+
+
+def _i32(value: int) -> dict:
+    return {"type": "i32_", "i32_": value}
+
+
+def _default_values() -> dict[str, dict]:
+    """Value envelopes keyed by API path, as returned by getData."""
+    values = {
+        API_PATHS["volume"]: _i32(25),
+        API_PATHS["mute"]: {"type": "bool_", "bool_": False},
+        API_PATHS["input"]: {"type": "cinemaPhysicalAudioInput", "cinemaPhysicalAudioInput": "hdmiarc"},
+        API_PATHS["mode"]: {"type": "cinemaPostProcessorMode", "cinemaPostProcessorMode": "movie"},
+        API_PATHS["night"]: {"type": "cinemaNightMode", "cinemaNightMode": "off"},
+        API_PATHS["dialog"]: {"type": "cinemaDialogMode", "cinemaDialogMode": "off"},
+        API_PATHS["decoder"]: {"type": "cinemaAudioDecoder", "cinemaAudioDecoder": "dolbyDigitalPlus"},
+        API_PATHS["eq_preset"]: {"type": "cinemaEqPreset", "cinemaEqPreset": "flat"},
+        API_PATHS["dirac"]: _i32(1),
+    }
+    for key in (
+        "bass",
+        "mid",
+        "treble",
+        "sub_wired",
+        "sub_wireless",
+        "back_height",
+        "back_left",
+        "back_right",
+        "front_height",
+        "side_left",
+        "side_right",
+    ):
+        values[API_PATHS[key]] = _i32(0)
+    return values
+
+
+DEFAULT_PLAYER = {
+    "state": "stopped",
+    "controls": {},
+    "trackRoles": {},
+    "mediaRoles": {},
+    "status": {},
+}
+
+DEFAULT_DIRAC_FILTERS = [(1, "Filter 1"), (2, "Filter 2")]
+
+DEFAULT_EUREKA = {
+    "name": "Klipsch Flexus CORE 300",
+    "mac_address": "00:11:22:33:44:55",
+    "cast_build_revision": "3.72.446070",
+    "build_version": "446070",
+    "ssdp_udn": "3fb1d5cd-a039-be9c-934c-877174add9bf",
+}
+
+
+class SoundbarSimulator:
+    """In-process soundbar emulating the device's timing model.
+
+    latency: seconds added to every request while the bar is on.
+    standby_latency: seconds added to every request in networkStandby.
+    Each port has its own processing slot: the native API is single-threaded,
+    so its concurrent clients queue instead of running in parallel, while the
+    Cast server (port 8008) is a separate process with a queue of its own.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        standby_latency: float = 3.0,
+        power: str = "online",
+    ) -> None:
+        self.latency = latency
+        self.standby_latency = standby_latency
+        self.power = power
+        self.values = _default_values()
+        self.player = copy.deepcopy(DEFAULT_PLAYER)
+        self.dirac_filters = list(DEFAULT_DIRAC_FILTERS)
+        self.eureka = dict(DEFAULT_EUREKA)
+        self._started_at = time.monotonic()
+        self._slot = asyncio.Lock()
+        self._cast_slot = asyncio.Lock()  # the Cast server is a separate process
+        self._runners: list[web.AppRunner] = []
+        # Event queues: id → (subscribed paths, pending events, wake-up)
+        self._queues: dict[str, tuple[set[str], list[dict], asyncio.Event]] = {}
+        # Counters for tests and benchmarks
+        self.requests: list[tuple[str, str]] = []  # (endpoint, path)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    # --- Lifecycle ---
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, cast_port: int = 0) -> tuple[int, int]:
+        """Start the API and Cast servers. Returns the bound (port, cast_port)."""
+        api_app = web.Application()
+        api_app.router.add_get("/api/getData", self._get_data)
+        api_app.router.add_get("/api/setData", self._set_data)
+        api_app.router.add_get("/api/getRows", self._get_rows)
+        api_app.router.add_post("/api/event/modifyQueue", self._modify_queue)
+        api_app.router.add_get("/api/event/pollQueue", self._poll_queue)
+        cast_app = web.Application()
+        cast_app.router.add_get("/setup/eureka_info", self._eureka_info)
+        bound = []
+        for app, app_port in ((api_app, port), (cast_app, cast_port)):
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, host, app_port)
+            await site.start()
+            self._runners.append(runner)
+            bound.append(runner.addresses[0][1])
+        return bound[0], bound[1]
+
+    async def stop(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+
+    # --- Device model ---
+
+    async def _process(self, endpoint: str, path: str) -> None:
+        """Occupy the API's single processing slot for one request's latency."""
+        self.requests.append((endpoint, path))
+        async with self._slot:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await self._latency()
+            finally:
+                self.in_flight -= 1
+
+    async def _latency(self) -> None:
+        delay = self.standby_latency if self.power == STANDBY else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _read(self, path: str) -> list | None:
+        if path == API_PATHS["power"]:
+            return [{"type": "powerTarget", "powerTarget": {"target": self.power, "reason": "userActivity"}}]
+        if path == API_PATHS["player"]:
+            return [copy.deepcopy(self.player)]
+        value = self.values.get(path)
+        return [copy.deepcopy(value)] if value is not None else None
+
+    def _activate(self, path: str, value: dict) -> bool:
+        if path == API_PATHS["power_req"]:
+            self.power = value.get("target", self.power)
+            self._notify(API_PATHS["power"])
+            return True
+        if path == API_PATHS["player_control"]:
+            control = value.get("control")
+            if control == "pause":
+                self.player["state"] = "paused"
+            elif control == "play":
+                self.player["state"] = "playing"
+            self._notify(API_PATHS["player"])
+            return control in ("pause", "play", "next", "previous")
+        return False
+
+    def external_change(self, path: str, value: dict) -> None:
+        """Change a value as the remote, TV (CEC) or Klipsch app would."""
+        self.values[path] = value
+        self._notify(path)
+
+    def _notify(self, path: str) -> None:
+        """Queue an update event for every queue subscribed to path."""
+        data = self._read(path)
+        if data is None:
+            return
+        for paths, events, wake in self._queues.values():
+            if path in paths:
+                events.append({"path": path, "itemType": "update", "itemValue": data[0]})
+                wake.set()
+
+    # --- Handlers ---
+
+    async def _get_data(self, request: web.Request) -> web.Response:
+        path = request.query.get("path", "")
+        await self._process("getData", path)
+        data = self._read(path)
+        if data is None:
+            return web.json_response({"error": f"unknown path {path}"}, status=500)
+        return web.json_response(data)
+
+    async def _set_data(self, request: web.Request) -> web.Response:
+        path = request.query.get("path", "")
+        roles = request.query.get("roles", "value")
+        await self._process("setData", path)
+        try:
+            value = json.loads(request.query.get("value", ""))
+        except ValueError:
+            return web.json_response({"error": "invalid value"}, status=400)
+        if roles == "activate":
+            if not self._activate(path, value):
+                return web.json_response({"error": f"cannot activate {path}"}, status=500)
+        elif path in self.values:
+            self.values[path] = value
+            self._notify(path)
+        else:
+            return web.json_response({"error": f"unknown path {path}"}, status=500)
+        return web.Response(text="")
+
+    async def _get_rows(self, request: web.Request) -> web.Response:
+        path = request.query.get("path", "")
+        await self._process("getRows", path)
+        if path == "dirac:filters":
+            rows = [{"title": name, "value": _i32(fid)} for fid, name in self.dirac_filters]
+        else:
+            rows = [
+                {"path": p, "title": p.rsplit("/", 1)[-1], "value": copy.deepcopy(v)}
+                for p, v in self.values.items()
+                if p.startswith(path)
+            ]
+        return web.json_response({"rowsCount": len(rows), "rows": rows})
+
+    async def _modify_queue(self, request: web.Request) -> web.Response:
+        await self._process("modifyQueue", "")
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"error": "invalid body"}, status=400)
+        queue_id = f"{{{len(self._queues):08x}}}"
+        paths = {item["path"] for item in body.get("subscribe", [])}
+        self._queues[queue_id] = (paths, [], asyncio.Event())
+        return web.json_response(queue_id)
+
+    async def _poll_queue(self, request: web.Request) -> web.Response:
+        """Long-poll: held open outside the processing slot until events arrive."""
+        queue = self._queues.get(request.query.get("queueId", ""))
+        if queue is None:
+            return web.json_response({"error": "unknown queue"}, status=404)
+        self.requests.append(("pollQueue", ""))
+        _paths, events, wake = queue
+        if not events:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(wake.wait(), float(request.query.get("timeout", 10)))
+        result = list(events)
+        events.clear()
+        wake.clear()
+        return web.json_response(result)
+
+    async def _eureka_info(self, request: web.Request) -> web.Response:
+        self.requests.append(("eureka", "/setup/eureka_info"))
+        async with self._cast_slot:
+            await self._latency()
+        info = dict(self.eureka, uptime=round(time.monotonic() - self._started_at, 1))
+        return web.json_response(info)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    sim = SoundbarSimulator(
+        latency=args.latency,
+        standby_latency=args.standby_latency,
+        power=STANDBY if args.standby else "online",
+    )
+    port, cast_port = await sim.start(args.host, args.port, args.cast_port)
+    print(f"Klipsch simulator on http://{args.host}:{port} (cast :{cast_port})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sim.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cast-port", type=int, default=8008)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per request when on")
+    parser.add_argument("--standby-latency", type=float, default=5.0, help="seconds per request in standby")
+    parser.add_argument("--standby", action="store_true", help="start in networkStandby")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_main(parser.parse_args()))
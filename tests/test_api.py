@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
 import pytest
 
-from custom_components.klipsch_flexus.api import KlipschAPI
+from custom_components.klipsch_flexus.api import DeviceUnavailableError, KlipschAPI
+from custom_components.klipsch_flexus.const import API_PATHS, BATCH_READ_MAX_FAILURES, BATCH_READ_ROOTS
+from custom_components.klipsch_flexus.schema import PARAMS
 
 
 @pytest.fixture
@@ -74,6 +77,118 @@ async def test_get_data_all_retries_fail(api: KlipschAPI) -> None:
         await api.get_data("player:volume")
 
 
+async def test_request_metrics_per_path(api: KlipschAPI) -> None:
+    """Test that every endpoint feeds the per-path histograms and failure counters."""
+    mock_response = AsyncMock()
+    mock_response.text = AsyncMock(return_value="")
+    mock_response.json = AsyncMock(return_value={"rows": []})
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=False)
+    mock_session = AsyncMock(spec=aiohttp.ClientSession)
+    mock_session.get = MagicMock(return_value=mock_response)
+    mock_session.closed = False
+    api._session = mock_session
+    api._own_session = False
+
+    await api.set_volume(30)
+    await api.get_rows("dirac:filters")
+    mock_session.get = MagicMock(side_effect=TimeoutError())
+    with pytest.raises(TimeoutError):
+        await api._do_get_data("cinema:/audioDecoder", 1)
+
+    assert api.total_requests == 3
+    assert api.failed_requests == 1
+    paths = api.metrics.as_dict()
+    assert paths["setData player:volume"]["count"] == 1
+    assert paths["getRows dirac:filters"]["p50_ms"] is not None
+    assert paths["getData cinema:/audioDecoder"]["timeouts"] == 1
+    assert set(api.metrics.by_operation()) == {"getData", "getRows", "setData"}
+
+
+async def test_apply_profile_writes_only_differences(api: KlipschAPI) -> None:
+    """Test that a profile writes only changed keys, in dependency order."""
+    api.set_data = AsyncMock(return_value="")
+    current = {"mode": "music", "eq_preset": "flat", "bass": 0, "night_mode": "off", "dialog_mode": "off"}
+    profile = {"night_mode": "night_mode_1", "bass": 2, "mode": "movie", "dialog_mode": "off"}
+
+    written = await api.apply_profile(profile, current)
+
+    # The mode write can reset dialog mode: sent again although it matched
+    assert written == ["mode", "bass", "night_mode", "dialog_mode"]
+    paths = [call.args[0] for call in api.set_data.await_args_list]
+    assert paths == [API_PATHS["mode"], API_PATHS["bass"], API_PATHS["night"], API_PATHS["dialog"]]
+
+    # An EQ preset change resets the tone: bass is re-sent
+    api.set_data.reset_mock()
+    written = await api.apply_profile({"eq_preset": "custom", "bass": 0}, current)
+    assert written == ["eq_preset", "bass"]
+
+    # Already active: no requests at all
+    api.set_data.reset_mock()
+    assert await api.apply_profile(profile, {**current, **profile}) == []
+    api.set_data.assert_not_called()
+
+    # A failed write still reports the keys acknowledged before it
+    api.set_data = AsyncMock(side_effect=["", aiohttp.ClientError()])
+    written = []
+    with pytest.raises(aiohttp.ClientError):
+        await api.apply_profile(profile, current, written)
+    assert written == ["mode"]
+
+
+async def test_stale_connection_reconnects_without_retry(api: KlipschAPI) -> None:
+    """Test that a dropped keep-alive socket is retried at once, outside the retry budget."""
+    calls = 0
+
+    async def request(timeout):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise aiohttp.ServerDisconnectedError()
+        return "ok"
+
+    assert await api._request_with_retry(request, retries=0) == "ok"
+    assert calls == 2
+
+
+async def test_adaptive_timeout_learned_from_latency(api: KlipschAPI) -> None:
+    """Test that timeouts shrink to a multiple of observed latency, within floor and ceiling."""
+    key = "getData player:volume"
+    assert api.latency.timeout_for(key, 8) == 8  # cold start: fixed timeout
+
+    for _ in range(10):
+        api.latency.record(key, 0.1)
+    assert api.latency.timeout_for(key, 8) == 1.0  # floor
+    for _ in range(10):
+        api.latency.record(key, 0.5)
+    learned = api.latency.timeout_for(key, 8)
+    assert 1.0 < learned < 8
+    # Retries escalate, capped at the ceiling
+    assert api.latency.timeout_for(key, 8, attempt=1) == min(learned * 2, 8)
+    assert api.latency.timeout_for(key, 8, attempt=5) == 8
+
+
+async def test_circuit_breaker_fails_fast(api: KlipschAPI) -> None:
+    """Test that repeated failures open the breaker and a probe closes it again."""
+    failing = AsyncMock(side_effect=TimeoutError)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            await api._request_with_retry(failing, retries=0)
+    assert api.breaker.state == "open"
+    assert api.breaker.retry_in > 0
+
+    # Open: refused without touching the network
+    failing.reset_mock()
+    with pytest.raises(DeviceUnavailableError):
+        await api._request_with_retry(failing, retries=0)
+    failing.assert_not_called()
+
+    # Backoff elapsed: one probe goes through and closes the breaker
+    api.breaker._retry_at = 0
+    assert await api._request_with_retry(AsyncMock(return_value="ok"), retries=0) == "ok"
+    assert api.breaker.state == "closed"
+
+
 async def test_get_status_graceful_degradation(api: KlipschAPI) -> None:
     """Test graceful degradation when some params fail."""
     call_count = 0
@@ -91,6 +206,7 @@ async def test_get_status_graceful_degradation(api: KlipschAPI) -> None:
         raise TimeoutError()
 
     api.get_data = mock_get_data
+    api._get_batch_rows = AsyncMock(side_effect=TimeoutError())
     result = await api.get_status()
 
     # Should still be online since not ALL params failed
@@ -101,6 +217,7 @@ async def test_get_status_graceful_degradation(api: KlipschAPI) -> None:
 async def test_get_status_all_fail(api: KlipschAPI) -> None:
     """Test offline status when all params fail."""
     api.get_data = AsyncMock(side_effect=TimeoutError())
+    api._get_batch_rows = AsyncMock(side_effect=TimeoutError())
     result = await api.get_status()
     assert result == {"online": False}
 
@@ -184,6 +301,267 @@ async def test_get_status_power_fail_means_offline(api: KlipschAPI) -> None:
     assert call_count == 1
 
 
+async def test_get_status_batched_subtrees(api: KlipschAPI) -> None:
+    """Test that getRows subtrees replace per-path getData reads."""
+    data_paths: list[str] = []
+
+    async def mock_get_data(path, timeout=8):
+        data_paths.append(path)
+        if "powermanager" in path:
+            return [{"powerTarget": {"target": "online"}}]
+        return [{"i32_": 7, "bool_": True}]
+
+    async def mock_get_rows(path):
+        if path == "settings:/cinema/dsp":
+            return {
+                "rows": [
+                    {"path": "settings:/cinema/dsp/cinemaEqPreset", "value": {"cinemaEqPreset": "rock"}},
+                    {"path": "settings:/cinema/dsp/sideLeftVolume", "value": {"i32_": -3}},
+                    {"path": "settings:/cinema/dsp/unrelated", "value": {"i32_": 1}},
+                ]
+            }
+        raise TimeoutError()
+
+    api.get_data = mock_get_data
+    api._get_batch_rows = mock_get_rows
+    result = await api.get_status()
+
+    assert result["eq_preset"] == "rock"
+    assert result["side_left"] == -3
+    assert "settings:/cinema/dsp/cinemaEqPreset" not in data_paths
+    assert "settings:/cinema/dsp/sideLeftVolume" not in data_paths
+    # Rows missing from the batch fall back to getData
+    assert "settings:/cinema/dsp/sideRightVolume" in data_paths
+    assert result["side_right"] == 7
+    assert result["failed_params"] == 0
+
+
+async def test_get_status_batch_without_rows_disabled(api: KlipschAPI) -> None:
+    """Test that a subtree returning no usable rows is not requested again."""
+
+    async def mock_get_data(path, timeout=8):
+        if "powermanager" in path:
+            return [{"powerTarget": {"target": "online"}}]
+        return [{"i32_": 0}]
+
+    api.get_data = mock_get_data
+    api._get_batch_rows = AsyncMock(return_value={"error": "not found"})
+    await api.get_status()
+    first_calls = api._get_batch_rows.call_count
+    await api.get_status()
+
+    assert first_calls > 0
+    assert api._get_batch_rows.call_count == first_calls
+
+
+async def test_get_status_failing_batch_disabled(api: KlipschAPI) -> None:
+    """Test that a subtree whose getRows keeps failing is dropped, without retries or breaker trips."""
+    attempts: list[str] = []
+
+    async def mock_get_data(path, timeout=8):
+        if "powermanager" in path:
+            return [{"powerTarget": {"target": "online"}}]
+        return [{"i32_": 0}]
+
+    async def mock_do_get_rows(path, timeout):
+        attempts.append(path)
+        raise TimeoutError()
+
+    api.get_data = mock_get_data
+    api._do_get_rows = mock_do_get_rows
+    for _ in range(BATCH_READ_MAX_FAILURES):
+        result = await api.get_status()
+        assert result["failed_params"] == 0
+    polls = len(attempts)
+    await api.get_status()
+
+    assert polls == BATCH_READ_MAX_FAILURES * len(BATCH_READ_ROOTS)  # one attempt per subtree and poll
+    assert len(attempts) == polls
+    assert api.breaker.state == "closed"
+
+
+async def test_get_status_key_subset_uses_cache(api: KlipschAPI) -> None:
+    """Test that a partial poll reads only the requested keys and keeps the rest cached."""
+    call_paths: list[str] = []
+    api._last_status = {"online": True, "power": "online", "volume": 10, "bass": 3, "side_left": -2}
+
+    async def mock_get_data(path, timeout=8):
+        call_paths.append(path)
+        if "powermanager" in path:
+            return [{"powerTarget": {"target": "online"}}]
+        return [{"i32_": 20}]
+
+    api.get_data = mock_get_data
+    api._get_batch_rows = AsyncMock()
+    result = await api.get_status(["volume"])
+
+    api._get_batch_rows.assert_not_called()
+    assert call_paths == ["powermanager:target", "player:volume"]
+    assert result["volume"] == 20
+    assert result["bass"] == 3
+    assert result["side_left"] == -2
+
+
+async def test_get_status_time_budget_resumes(api: KlipschAPI) -> None:
+    """Test that an exhausted poll budget leaves keys stale and the next poll resumes there."""
+    call_paths: list[str] = []
+    api._batch_unsupported = set(BATCH_READ_ROOTS)
+
+    async def mock_get_data(path, timeout=8):
+        call_paths.append(path)
+        if "powermanager" in path:
+            return [{"powerTarget": {"target": "online"}}]
+        return [{"i32_": 5, "bool_": False}]
+
+    api.get_data = mock_get_data
+    result = await api.get_status(budget=0)
+
+    # At least one read per poll, the rest is served from the cache
+    assert call_paths == ["powermanager:target", API_PATHS["volume"]]
+    assert result["volume"] == 5
+    assert result["stale_params"] == [key for key in PARAMS if key != "volume"]
+    assert result["failed_params"] == 0
+
+    call_paths.clear()
+    result = await api.get_status(budget=0)
+    assert call_paths == ["powermanager:target", API_PATHS["mute"]]
+
+    # A partial poll also starts at the cursor (input), wrapping around
+    call_paths.clear()
+    await api.get_status(["volume", "bass"], budget=0)
+    assert call_paths == ["powermanager:target", API_PATHS["bass"]]
+
+    call_paths.clear()
+    result = await api.get_status()
+    assert len(call_paths) == 1 + len(PARAMS)
+    assert result["stale_params"] == []
+
+
+async def test_set_data_coalesces_pending_writes(api: KlipschAPI) -> None:
+    """Test that queued writes to one path collapse to the newest value."""
+    sent: list[tuple[str, dict]] = []
+
+    async def mock_do_set_data(path, value, roles, timeout):
+        sent.append((path, value))
+        return "ok"
+
+    api._do_set_data = mock_do_set_data
+    async with api._scheduler.slot():  # simulate a poll holding the device
+        tasks = [asyncio.create_task(api.set_volume(level)) for level in (10, 20, 30)]
+        mute = asyncio.create_task(api.set_mute(True))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        # Superseded callers resolve without waiting for the device
+        assert tasks[0].done() and tasks[1].done()
+        assert not tasks[2].done()
+    await asyncio.gather(*tasks, mute)
+
+    assert sent == [
+        ("player:volume", {"type": "i32_", "i32_": 30}),
+        ("settings:/mediaPlayer/mute", {"type": "bool_", "bool_": True}),
+    ]
+
+
+async def test_retried_write_superseded_by_newer_value(api: KlipschAPI) -> None:
+    """Test that a write retrying after a timeout doesn't overwrite a newer value sent meanwhile."""
+    sent: list[int] = []
+    failed = asyncio.Event()
+
+    async def mock_do_set_data(path, value, roles, timeout):
+        sent.append(value["i32_"])
+        if len(sent) == 1:
+            failed.set()
+            raise TimeoutError()
+        return "ok"
+
+    api._do_set_data = mock_do_set_data
+    first = asyncio.create_task(api.set_volume(10))
+    await failed.wait()
+    await api.set_volume(40)  # sent during the first write's retry delay
+
+    await first  # resolved as superseded, not retried
+    assert sent == [10, 40]
+    assert api.breaker.state == "closed"
+
+
+async def test_affected_keys_recorded_on_acknowledgement(api: KlipschAPI) -> None:
+    """Test that a write still queued or in flight leaves its keys to its own confirmation."""
+    release = asyncio.Event()
+
+    async def mock_do_set_data(path, value, roles, timeout):
+        await release.wait()
+        return "ok"
+
+    api._do_set_data = mock_do_set_data
+    write = asyncio.create_task(api.set_volume(30))
+    await asyncio.sleep(0)
+    assert api.take_affected() == set()  # an earlier confirmation firing now
+
+    release.set()
+    await write
+    assert api.take_affected() == {"volume"}
+
+
+async def test_set_data_activate_not_coalesced(api: KlipschAPI) -> None:
+    """Test that activate actions are all sent."""
+    sent: list[dict] = []
+
+    async def mock_do_set_data(path, value, roles, timeout):
+        sent.append(value)
+        return "ok"
+
+    api._do_set_data = mock_do_set_data
+    await asyncio.gather(api.media_control("next"), api.media_control("next"))
+
+    assert sent == [{"control": "next"}, {"control": "next"}]
+
+
+async def test_scheduler_commands_before_poll_reads(api: KlipschAPI) -> None:
+    """Test that a command queued behind poll reads is sent first."""
+    order: list[str] = []
+
+    async def mock_do_get_data(path, timeout):
+        order.append(path)
+        return [{"i32_": 0}]
+
+    async def mock_do_set_data(path, value, roles, timeout):
+        order.append(f"set {path}")
+        return "ok"
+
+    api._do_get_data = mock_do_get_data
+    api._do_set_data = mock_do_set_data
+    async with api._scheduler.slot():
+        reads = [asyncio.create_task(api.get_data(p)) for p in ("cinema:cinemaBass", "cinema:cinemaMid")]
+        await asyncio.sleep(0)
+        command = asyncio.create_task(api.set_power("online"))
+        await asyncio.sleep(0)
+    await asyncio.gather(*reads, command)
+
+    assert order == ["set powermanager:targetRequest", "cinema:cinemaBass", "cinema:cinemaMid"]
+
+
+async def test_cast_requests_bypass_port_80_slot(api: KlipschAPI) -> None:
+    """Test that eureka_info (port 8008) runs while the port-80 slot is taken, with its own metrics."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json = AsyncMock(return_value={"mac_address": "00:11:22:33:44:55"})
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=False)
+    mock_session = AsyncMock(spec=aiohttp.ClientSession)
+    mock_session.get = MagicMock(return_value=mock_response)
+    mock_session.closed = False
+    api._session = mock_session
+    api._own_session = False
+
+    async with api._scheduler.slot():
+        info = await asyncio.wait_for(api.get_device_info(), 1)
+
+    assert info["mac_address"] == "00:11:22:33:44:55"
+    assert api.cast_metrics.as_dict()["eureka /setup/eureka_info"]["count"] == 1
+    assert api.total_requests == 0  # port-80 counters untouched
+    assert api.metrics.as_dict() == {}
+
+
 async def test_close_session(api: KlipschAPI) -> None:
     """Test session cleanup."""
     mock_session = AsyncMock(spec=aiohttp.ClientSession)
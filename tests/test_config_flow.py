@@ -56,6 +56,7 @@ async def test_user_flow_success(hass: HomeAssistant) -> None:
     with patch("custom_components.klipsch_flexus.config_flow.KlipschAPI") as mock_cls:
         api = mock_cls.return_value
         api.get_status = AsyncMock(return_value=MOCK_STATUS)
+        api.get_device_info = AsyncMock(return_value=None)
         api.close = AsyncMock()
 
         result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
@@ -73,6 +74,7 @@ async def test_user_flow_cannot_connect(hass: HomeAssistant) -> None:
     with patch("custom_components.klipsch_flexus.config_flow.KlipschAPI") as mock_cls:
         api = mock_cls.return_value
         api.get_status = AsyncMock(return_value={"online": False})
+        api.get_device_info = AsyncMock(return_value=None)
         api.close = AsyncMock()
 
         result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
@@ -86,6 +88,7 @@ async def test_user_flow_exception(hass: HomeAssistant) -> None:
     with patch("custom_components.klipsch_flexus.config_flow.KlipschAPI") as mock_cls:
         api = mock_cls.return_value
         api.get_status = AsyncMock(side_effect=ConnectionError)
+        api.get_device_info = AsyncMock(return_value=None)
         api.close = AsyncMock()
 
         result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
@@ -0,0 +1,445 @@
+"""Tests for the Klipsch Flexus coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+from homeassistant.helpers.storage import Store
+
+from custom_components.klipsch_flexus.const import (
+    CAST_LIVENESS_MAX_POLLS,
+    DOMAIN,
+    POLL_CLASS_INTERVALS,
+    STORAGE_VERSION,
+)
+from custom_components.klipsch_flexus.coordinator import DIRAC_FILTERS_KEY, KlipschCoordinator, status_keys
+from custom_components.klipsch_flexus.schema import PARAMS, POLL_CLASSES
+
+from .conftest import MOCK_HOST, MOCK_STATUS
+
+STORAGE_KEY = f"{DOMAIN}.test_entry_id"
+MOCK_EUREKA = {"name": "Klipsch Flexus CORE 300", "cast_build_revision": "3.72.446070", "uptime": 1000.0}
+MOCK_FILTERS = [{"id": 1, "name": "Filter 1"}]
+
+
+def _coordinator(hass) -> KlipschCoordinator:
+    return KlipschCoordinator(hass, MagicMock(), MOCK_HOST, store=Store(hass, STORAGE_VERSION, STORAGE_KEY))
+
+
+async def test_restore_snapshot(hass, hass_storage) -> None:
+    """Test that the stored snapshot becomes stale initial data."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {
+            "status": MOCK_STATUS,
+            "dirac_filters": MOCK_FILTERS,
+            "device_info": MOCK_EUREKA,
+            "boot_time": time.time() - 1000,
+        },
+    }
+    coordinator = _coordinator(hass)
+
+    assert await coordinator.async_restore()
+    assert coordinator.data["stale"] is True
+    assert coordinator.data["volume"] == 25
+    assert coordinator.dirac_filters == MOCK_FILTERS
+    assert coordinator.device_info == MOCK_EUREKA
+
+
+async def test_snapshot_keeps_last_good_state(hass) -> None:
+    """Test that a save written after the bar went offline stores the last status read, not the placeholder."""
+    coordinator = KlipschCoordinator(hass, MagicMock(), MOCK_HOST)  # no store: only the snapshot is built
+    coordinator._async_schedule_save({**MOCK_STATUS, "poll_time_ms": 900})
+    coordinator.data = {"online": False}  # offline by the time the delayed save runs
+
+    stored = coordinator._data_to_store()["status"]
+    assert stored["online"] is True
+    assert stored["volume"] == 25
+    assert "poll_time_ms" not in stored
+
+
+async def test_restore_without_snapshot(hass, hass_storage) -> None:
+    """Test that a missing snapshot leaves startup to the first refresh."""
+    coordinator = _coordinator(hass)
+
+    assert not await coordinator.async_restore()
+    assert coordinator.data is None
+
+
+async def test_firmware_change_invalidates_snapshot(hass) -> None:
+    """Test that restored Dirac filters are dropped after a firmware update or reboot."""
+    coordinator = _coordinator(hass)
+    coordinator.device_info = MOCK_EUREKA
+    coordinator.dirac_filters = list(MOCK_FILTERS)
+    coordinator._boot_time = time.time() - 1000
+
+    coordinator._check_device_identity(MOCK_EUREKA)
+    assert coordinator.dirac_filters == MOCK_FILTERS  # same boot, same firmware
+
+    coordinator._check_device_identity({**MOCK_EUREKA, "uptime": 5.0})
+    assert coordinator.dirac_filters == []  # rebooted
+
+    coordinator.dirac_filters = list(MOCK_FILTERS)
+    coordinator._check_device_identity({**MOCK_EUREKA, "uptime": 10.0, "cast_build_revision": "3.73.1"})
+    assert coordinator.dirac_filters == []
+
+
+async def test_staged_first_refresh(hass, mock_api) -> None:
+    """Test that the first stage reads only hot keys and the rest follows incrementally."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    mock_api.get_device_info = AsyncMock(return_value=None)
+    mock_api.get_player_data = AsyncMock(return_value={"state": "playing"})
+    streaming = {**MOCK_STATUS, "input": "googlecast"}  # the player is read for streaming inputs only
+    hot = {key: streaming[key] for key in ("online", "power", *POLL_CLASSES["hot"])}
+    mock_api.get_status = AsyncMock(return_value=hot)
+
+    coordinator._first_stage = True
+    coordinator.data = await coordinator._async_update_data()
+    coordinator._first_stage = False
+
+    mock_api.get_status.assert_awaited_once_with(POLL_CLASSES["hot"])
+    mock_api.get_dirac_filters.assert_not_called()
+    mock_api.get_player_data.assert_not_called()
+    assert "bass" not in coordinator.data
+
+    # The rest loads at once; only the poll timer waits for the fleet phase
+    mock_api.get_status = AsyncMock(return_value=streaming.copy())
+    coordinator.async_set_updated_data = MagicMock()
+    coordinator._deferred_pending = True
+    entry = MagicMock()
+    entry.async_create_background_task = lambda hass, target, name: hass.async_create_task(target)
+    coordinator.async_start_deferred_load(entry, 120)
+    await hass.async_block_till_done()
+    coordinator.async_set_updated_data.assert_not_called()  # poll timer untouched
+    coordinator._unsub_phase()
+
+    requested = mock_api.get_status.await_args.args[0]
+    assert set(requested) == set(POLL_CLASSES["warm"]) | set(POLL_CLASSES["cold"])
+    assert coordinator.data["bass"] == 0
+    assert coordinator.dirac_filters == [{"id": 1, "name": "Filter 1"}, {"id": 2, "name": "Filter 2"}]
+    assert coordinator.data["player"] == {"state": "playing"}
+
+
+def _writes(*keys: str, error: Exception | None = None):
+    """Fake KlipschAPI.apply_profile acknowledging keys, then raising error if given."""
+
+    async def apply_profile(profile: dict, current: dict, written: list[str]) -> list[str]:
+        written.extend(keys)
+        if error:
+            raise error
+        return written
+
+    return apply_profile
+
+
+async def test_snapshot_and_restore(hass, mock_api) -> None:
+    """Test that a snapshot needs no reads and restore writes only what changed."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    coordinator.async_request_delayed_refresh = MagicMock()
+    mock_api.apply_profile = AsyncMock(side_effect=_writes("volume"))
+
+    snapshot = await coordinator.async_take_snapshot("doorbell")
+    mock_api.get_status.assert_not_called()
+    assert snapshot["volume"] == 25
+    assert "decoder" not in snapshot
+
+    coordinator.data["volume"] = 60
+    assert await coordinator.async_restore_snapshot("doorbell") == ["volume"]
+
+    mock_api.apply_profile.assert_awaited_once_with(snapshot, {**MOCK_STATUS, "volume": 60}, ["volume"])
+    assert coordinator.data["volume"] == 25  # shown before the confirming refresh
+    coordinator.async_request_delayed_refresh.assert_called_once()
+
+
+async def test_profile_failing_partway_confirms_written_keys(hass, mock_api) -> None:
+    """Test that keys written before a profile write fails are still shown and confirmed."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = {**MOCK_STATUS, "mode": "music", "bass": 0}
+    coordinator.async_request_delayed_refresh = MagicMock()
+    mock_api.apply_profile = AsyncMock(side_effect=_writes("mode", error=aiohttp.ClientError()))
+
+    with pytest.raises(aiohttp.ClientError):
+        await coordinator.async_apply_profile({"mode": "movie", "bass": 2})
+
+    assert coordinator.data["mode"] == "movie"
+    assert coordinator.data["bass"] == 0  # never acknowledged
+    coordinator.async_request_delayed_refresh.assert_called_once()
+
+
+async def test_player_fetch_policy(hass, mock_api) -> None:
+    """Test that the player is read only for streaming inputs or while active."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+
+    assert await coordinator._async_fetch_player({"input": "hdmiarc"}) is None
+    mock_api.get_player_data.assert_not_called()
+
+    playing = {"state": "playing", "trackRoles": {"title": "Song"}, "status": {"duration": 5000}}
+    mock_api.get_player_data = AsyncMock(return_value=playing)
+    assert await coordinator._async_fetch_player({"input": "googlecast"}) == playing
+    # 5 s track ends before the next 15 s poll: player re-read scheduled
+    assert coordinator._unsub_track_end is not None
+
+    # Switched to TV while playing: keep reading until playback stops
+    coordinator.data = {"online": True, "input": "hdmiarc", "player": playing}
+    await coordinator._async_fetch_player(coordinator.data)
+    assert mock_api.get_player_data.await_count == 2
+
+    await coordinator.async_shutdown()
+    assert coordinator._unsub_track_end is None
+
+
+async def test_commands_confirmed_once(hass, mock_api) -> None:
+    """Test that commands in quick succession share one confirming read."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    mock_api.take_affected = MagicMock(side_effect=[{"volume"}, set()])
+    mock_api.read_keys = AsyncMock(return_value={"volume": 30})
+
+    for _ in range(5):
+        coordinator.async_request_delayed_refresh(delay=0)
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
+
+    mock_api.read_keys.assert_awaited_once_with({"volume"})
+    assert coordinator.data["volume"] == 30
+    assert coordinator.refresh_counts == {"requested": 5, "coalesced": 4, "executed": 1}
+
+
+async def test_power_command_refresh_counted_once(hass, mock_api) -> None:
+    """Test that a confirmation escalating to a full poll counts as one request."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    mock_api.take_affected = MagicMock(return_value={"power"})
+
+    coordinator.async_request_delayed_refresh(delay=0)
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
+
+    mock_api.get_status.assert_awaited_once()
+    assert coordinator.refresh_counts == {"requested": 1, "coalesced": 0, "executed": 1}
+
+
+async def test_single_flight_refresh(hass, mock_api) -> None:
+    """Test that a refresh requested during a poll waits for it instead of polling again."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    release = asyncio.Event()
+
+    async def slow_status(keys=None):
+        await release.wait()
+        return MOCK_STATUS.copy()
+
+    mock_api.get_status = AsyncMock(side_effect=slow_status)
+    first = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    second = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, second)
+
+    mock_api.get_status.assert_awaited_once()
+    assert coordinator.data["volume"] == 25
+    assert coordinator.refresh_counts == {"requested": 2, "coalesced": 1, "executed": 1}
+
+
+async def test_status_snapshot_per_update(hass, mock_api) -> None:
+    """Test that the snapshot is built once per update and optimistic writes replace data."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    status = coordinator.status
+    assert coordinator.status is status
+
+    previous = coordinator.data
+    coordinator.async_set_optimistic(volume=40)
+
+    assert previous["volume"] == 25  # never mutated in place
+    assert coordinator.status is not status
+    assert coordinator.status.volume == 40
+
+
+async def test_listeners_notified_per_key(hass, mock_api) -> None:
+    """Test that an update wakes only listeners whose status keys changed."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    volume, bass, dirac, everything = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+    coordinator.async_add_listener(volume, status_keys("volume"))
+    coordinator.async_add_listener(bass, status_keys("bass"))
+    coordinator.async_add_listener(dirac, status_keys("dirac", DIRAC_FILTERS_KEY))
+    coordinator.async_add_listener(everything)
+    coordinator.data = MOCK_STATUS.copy()
+    coordinator.async_update_listeners()  # first dispatch wakes everyone
+    for listener in (volume, bass, dirac, everything):
+        listener.reset_mock()
+
+    coordinator.async_set_optimistic(volume=40)
+    volume.assert_called_once()
+    everything.assert_called_once()
+    bass.assert_not_called()
+    dirac.assert_not_called()
+
+    volume.reset_mock()
+    coordinator.dirac_filters = list(MOCK_FILTERS)  # catalog read after setup
+    coordinator.async_update_listeners()
+    dirac.assert_called_once()
+    volume.assert_not_called()
+    bass.assert_not_called()
+
+    dirac.reset_mock()
+    coordinator.async_set_optimistic(power="networkStandby")
+    for listener in (volume, bass, dirac):
+        listener.assert_called_once()  # power is in every context
+
+
+async def test_write_overlay_survives_older_poll(hass, mock_api) -> None:
+    """Test that a poll started before a write can't revert the optimistic value."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    release = asyncio.Event()
+
+    async def slow_status(keys=None):
+        await release.wait()
+        return MOCK_STATUS.copy()  # read before the write: volume 25
+
+    mock_api.get_status = AsyncMock(side_effect=slow_status)
+    poll = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    coordinator.async_set_optimistic(volume=40)
+    release.set()
+    await poll
+    assert coordinator.data["volume"] == 40
+
+    # An event from before the write doesn't revert it either
+    mock_api.parse_events = MagicMock(return_value={"volume": 25})
+    coordinator._async_handle_events([{}])
+    assert coordinator.data["volume"] == 40
+
+    # A poll started after the write settles it
+    mock_api.get_status = AsyncMock(return_value={**MOCK_STATUS, "volume": 40})
+    await coordinator.async_refresh()
+    assert coordinator.data["volume"] == 40
+    assert not coordinator._pending_writes
+
+
+async def test_demand_driven_polling(hass, mock_api) -> None:
+    """Test that polls skip keys no consumer demands and services read them first."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    coordinator.async_request_delayed_refresh = MagicMock()
+    mock_api.read_keys = AsyncMock(side_effect=[{"volume": 25}, {"bass": 2}])
+    remove = coordinator.async_add_listener(MagicMock(), status_keys("volume"))
+    await hass.async_block_till_done()
+    mock_api.read_keys.assert_awaited_once_with(["volume"])  # new demand read at once
+
+    await coordinator._async_update_data()
+    mock_api.get_status.assert_awaited_once_with(["volume"])
+
+    mock_api.apply_profile = AsyncMock(side_effect=_writes("bass"))
+    await coordinator.async_apply_profile({"bass": 3})
+    mock_api.read_keys.assert_awaited_with(["bass"])
+    assert mock_api.apply_profile.await_args.args[1]["bass"] == 2
+
+    remove()
+    coordinator._force_full_poll = True
+    await coordinator._async_update_data()
+    assert set(mock_api.get_status.await_args.args[0]) == set(PARAMS)  # no consumers: everything
+
+
+async def test_poll_classes_read_when_due(hass, mock_api) -> None:
+    """Test that warm and cold keys are skipped until their interval has passed."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    mock_api.get_status = AsyncMock(return_value=MOCK_STATUS.copy())
+
+    def requested() -> set[str]:
+        return set(mock_api.get_status.await_args.args[0])
+
+    await coordinator._async_update_data()  # first poll reads everything
+    assert requested() == {key for keys in POLL_CLASSES.values() for key in keys}
+
+    await coordinator._async_update_data()
+    assert requested() == set(POLL_CLASSES["hot"])
+
+    coordinator._class_polled_at["warm"] -= POLL_CLASS_INTERVALS["warm"]
+    await coordinator._async_update_data()
+    assert requested() == set(POLL_CLASSES["hot"]) | set(POLL_CLASSES["warm"])
+
+    coordinator._class_polled_at["cold"] -= POLL_CLASS_INTERVALS["cold"]
+    await coordinator._async_update_data()
+    assert requested() == set(POLL_CLASSES["hot"]) | set(POLL_CLASSES["cold"])
+
+
+async def test_cast_server_as_liveness_signal(hass, mock_api) -> None:
+    """Test that a failed port-80 poll with the Cast server answering keeps the last state for a few polls."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    coordinator._device_info_live = True
+    mock_api.get_status = AsyncMock(return_value={"online": False})
+    mock_api.get_device_info = AsyncMock(return_value=MOCK_EUREKA)
+
+    for _ in range(CAST_LIVENESS_MAX_POLLS):
+        await coordinator.async_refresh()
+        assert coordinator.data["online"] is True  # last state kept, marked stale
+        assert coordinator.data["stale"] is True
+        assert coordinator.data["volume"] == 25
+    assert mock_api.get_device_info.await_count == CAST_LIVENESS_MAX_POLLS
+
+    await coordinator.async_refresh()  # bounded: offline after that
+    assert coordinator.data == {"online": False}
+    assert mock_api.get_device_info.await_count == CAST_LIVENESS_MAX_POLLS
+
+    # Offline now: no further Cast probes
+    await coordinator.async_refresh()
+    assert mock_api.get_device_info.await_count == CAST_LIVENESS_MAX_POLLS
+
+
+async def test_event_loop_merges_and_falls_back_to_polling(hass, mock_api) -> None:
+    """Test that events update data without re-arming the poll timer, and a lost queue triggers a poll."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    coordinator.async_set_updated_data = MagicMock()
+    polled = asyncio.Event()
+    mock_api.event_paths = MagicMock(return_value=["player:volume"])
+    mock_api.subscribe_events = AsyncMock(return_value="{0}")
+    mock_api.parse_events = MagicMock(return_value={"volume": 30})
+    mock_api.poll_events = AsyncMock(side_effect=[[{"path": "player:volume"}], aiohttp.ClientError()])
+    push_states: list[bool] = []
+
+    async def fallback_refresh() -> None:
+        push_states.append(coordinator.push_active)
+        polled.set()
+
+    coordinator.async_request_refresh = fallback_refresh
+    loop_task = hass.async_create_background_task(coordinator._async_event_loop(), "event loop")
+    await asyncio.wait_for(polled.wait(), 5)
+    loop_task.cancel()
+
+    assert coordinator.data["volume"] == 30
+    coordinator.async_set_updated_data.assert_not_called()  # consistency poll not postponed
+    assert push_states == [False]  # polling again before the catch-up refresh
+
+
+async def test_event_loop_paces_immediate_answers(hass, mock_api, monkeypatch) -> None:
+    """Test that pollQueue answered at once is paced, backing off while it comes back empty."""
+    coordinator = KlipschCoordinator(hass, mock_api, MOCK_HOST)
+    coordinator.data = MOCK_STATUS.copy()
+    mock_api.event_paths = MagicMock(return_value=[])
+    mock_api.subscribe_events = AsyncMock(return_value="{0}")
+    mock_api.parse_events = MagicMock(return_value={})
+    mock_api.poll_events = AsyncMock(side_effect=[[], [], [], [{"path": "x"}], [], *[[]] * 10])
+    delays: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+        if len(delays) == 8:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr("custom_components.klipsch_flexus.coordinator.asyncio.sleep", fake_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await coordinator._async_event_loop()
+
+    assert delays == [1, 2, 4, 1, 2, 4, 8, 16]
+    assert coordinator.push_active is False
@@ -0,0 +1,82 @@
+"""Tests for the Klipsch Flexus fleet scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.klipsch_flexus.const import FLEET_RATE_WINDOW
+from custom_components.klipsch_flexus.fleet import FleetScheduler
+
+
+async def test_phases_spread_and_stable() -> None:
+    """Test that devices get distinct phases and keep them as others come and go."""
+    fleet = FleetScheduler()
+    phases = [fleet.register(f"entry_{i}", 15) for i in range(5)]
+
+    assert phases[0] == 0
+    assert len(set(phases)) == 5
+    assert all(0 <= phase < 15 for phase in phases)
+    assert fleet.register("entry_3", 15) == phases[3]
+
+    fleet.unregister("entry_2")
+    assert fleet.register("entry_new", 15) == phases[2]  # freed phase is reused
+
+
+async def test_global_concurrency_limit() -> None:
+    """Test that no more than max_concurrent requests run at once across devices."""
+    fleet = FleetScheduler(max_concurrent=2)
+    peak = 0
+
+    async def request() -> None:
+        nonlocal peak
+        async with fleet.slot():
+            peak = max(peak, fleet.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request() for _ in range(8)))
+
+    assert peak == 2
+    assert fleet.in_flight == 0
+    assert fleet.request_rate() > 0
+
+
+async def test_limit_follows_registered_devices() -> None:
+    """Test that the lowest limit of the registered devices applies, and queued requests follow a raised one."""
+    fleet = FleetScheduler()
+    fleet.register("entry_1", 15, 3)
+    fleet.register("entry_2", 15, 1)
+    assert fleet.max_concurrent == 1
+
+    release = asyncio.Event()
+    peak = 0
+
+    async def request() -> None:
+        nonlocal peak
+        async with fleet.slot():
+            peak = max(peak, fleet.in_flight)
+            await release.wait()
+
+    tasks = [asyncio.create_task(request()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert fleet.in_flight == 1
+
+    fleet.unregister("entry_2")  # cap back to 3: the queued requests start
+    await asyncio.sleep(0)
+    assert fleet.in_flight == 3
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == 3
+    assert fleet.in_flight == 0
+
+
+async def test_request_log_trimmed_without_rate_reads(monkeypatch) -> None:
+    """Test that request start times outside the rate window are dropped as requests are made."""
+    fleet = FleetScheduler()
+    clock = [1000.0]
+    monkeypatch.setattr("custom_components.klipsch_flexus.fleet.time.monotonic", lambda: clock[0])
+    for _ in range(50):
+        async with fleet.slot():
+            pass
+        clock[0] += 10
+
+    assert len(fleet._started) <= FLEET_RATE_WINDOW // 10 + 1
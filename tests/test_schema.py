@@ -0,0 +1,38 @@
+"""Tests for the Klipsch Flexus parameter schema."""
+
+from __future__ import annotations
+
+from custom_components.klipsch_flexus.const import API_PATHS, CHANNEL_LEVELS, POLL_CLASS_INTERVALS
+from custom_components.klipsch_flexus.schema import PARAMS, PARAMS_BY_PATH, POLL_CLASSES, path_query
+
+
+def test_registry_consistent() -> None:
+    """Test that every parameter is polled once and every level is in the registry."""
+    polled = [key for keys in POLL_CLASSES.values() for key in keys]
+    assert sorted(polled) == sorted(PARAMS)
+    assert set(POLL_CLASSES) == set(POLL_CLASS_INTERVALS)
+    assert len(PARAMS_BY_PATH) == len(PARAMS)
+    assert all(PARAMS[key].min == -6 and PARAMS[key].max == 6 for key, _icon in CHANNEL_LEVELS)
+    assert all(key in PARAMS for param in PARAMS.values() for key in param.affects if key != "player")
+
+
+def test_parse_and_encode() -> None:
+    """Test the value envelope round trip, including translated values."""
+    night = PARAMS["night_mode"]
+    assert night.encode("night_mode_1") == {"type": "cinemaNightMode", "cinemaNightMode": "nightMode_1"}
+    assert night.parse([night.encode("night_mode_1")]) == "night_mode_1"
+    assert night.parse([{"type": "cinemaNightMode"}]) == "off"
+
+    volume = PARAMS["volume"]
+    assert volume.parse([volume.encode(40)]) == 40
+    assert PARAMS["dirac"].parse([{}]) == -1
+    assert PARAMS["eq_preset"].affects == ("eq_preset", "bass", "mid", "treble")
+    assert PARAMS["bass"].affects == ("bass",)
+
+
+def test_path_query() -> None:
+    """Test that known paths are pre-encoded and unknown ones encoded on demand."""
+    assert path_query(API_PATHS["volume"]) == "player:volume"
+    assert path_query(API_PATHS["player"]) == "player:player/data"
+    assert path_query("dirac:filters") == "dirac:filters"
+    assert path_query("a b") == "a%20b"
@@ -0,0 +1,120 @@
+"""Tests for KlipschAPI against the local soundbar simulator."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.klipsch_flexus.api import KlipschAPI
+
+from .simulator import STANDBY, SoundbarSimulator
+
+
+@pytest.fixture
+async def simulator(socket_enabled):
+    """Start a simulator on ephemeral localhost ports."""
+    sim = SoundbarSimulator()
+    port, cast_port = await sim.start()
+    sim.port, sim.cast_port = port, cast_port
+    yield sim
+    await sim.stop()
+
+
+@pytest.fixture
+async def sim_api(simulator: SoundbarSimulator):
+    """KlipschAPI pointed at the simulator."""
+    api = KlipschAPI("127.0.0.1", port=simulator.port, cast_port=simulator.cast_port)
+    yield api
+    await api.close()
+
+
+async def test_status_round_trip(simulator: SoundbarSimulator, sim_api: KlipschAPI) -> None:
+    """Test that a full poll parses the simulator's JSON shapes."""
+    status = await sim_api.get_status()
+
+    assert status["online"] is True
+    assert status["power"] == "online"
+    assert status["volume"] == 25
+    assert status["input"] == "hdmiarc"
+    assert status["eq_preset"] == "flat"
+    assert status["failed_params"] == 0
+    assert await sim_api.get_dirac_filters() == [{"id": 1, "name": "Filter 1"}, {"id": 2, "name": "Filter 2"}]
+    info = await sim_api.get_device_info()
+    assert info["mac_address"] == "00:11:22:33:44:55"
+
+
+async def test_set_value_and_activate(simulator: SoundbarSimulator, sim_api: KlipschAPI) -> None:
+    """Test value writes and activate actions."""
+    await sim_api.set_volume(40)
+    await sim_api.set_night_mode("night_mode_1")
+    await sim_api.set_power(STANDBY)
+
+    assert simulator.values["player:volume"]["i32_"] == 40
+    assert simulator.values["cinema:/nightMode"]["cinemaNightMode"] == "nightMode_1"
+    assert simulator.power == STANDBY
+
+
+async def test_single_threaded(simulator: SoundbarSimulator, sim_api: KlipschAPI) -> None:
+    """Test that concurrent clients are processed one at a time."""
+    simulator.latency = 0.02
+    other = KlipschAPI("127.0.0.1", port=simulator.port, cast_port=simulator.cast_port)
+    try:
+        await asyncio.gather(sim_api.get_status(), other.get_status(), other.get_device_info())
+    finally:
+        await other.close()
+
+    assert simulator.max_in_flight == 1
+
+
+async def test_standby_stall(simulator: SoundbarSimulator, sim_api: KlipschAPI) -> None:
+    """Test that standby requests stall and the API keeps the poll to power only."""
+    await sim_api.get_status()
+    simulator.power = STANDBY
+    simulator.standby_latency = 0.2
+    simulator.requests.clear()
+
+    status = await sim_api.get_status()
+
+    assert status["power"] == STANDBY
+    assert status["volume"] == 25  # served from cache
+    assert status["poll_time_ms"] >= 200
+    assert simulator.requests == [("getData", "powermanager:target")]
+
+
+async def test_event_queue_push(simulator: SoundbarSimulator, sim_api: KlipschAPI) -> None:
+    """Test that subscribed changes arrive through the event queue."""
+    queue_id = await sim_api.subscribe_events(sim_api.event_paths())
+    poll = asyncio.create_task(sim_api.poll_events(queue_id, timeout=5))
+    await asyncio.sleep(0.05)
+    simulator.external_change("player:volume", {"type": "i32_", "i32_": 33})
+    simulator.external_change("cinema:/nightMode", {"type": "cinemaNightMode", "cinemaNightMode": "nightMode_1"})
+
+    changes = sim_api.parse_events(await poll)
+
+    assert changes == {"volume": 33, "night_mode": "night_mode_1"}
+    # Partial polls build on pushed values
+    status = await sim_api.get_status(["input"])
+    assert status["volume"] == 33
+
+
+async def test_event_queue_timeout_returns_empty(simulator: SoundbarSimulator, sim_api: KlipschAPI) -> None:
+    """Test that an idle long-poll returns no events."""
+    queue_id = await sim_api.subscribe_events(["player:volume"])
+    assert await sim_api.poll_events(queue_id, timeout=0.1) == []
+
+
+async def test_confirm_write_reads_only_affected(simulator: SoundbarSimulator, sim_api: KlipschAPI) -> None:
+    """Test that confirming a volume change costs one read, not a poll."""
+    await sim_api.set_volume(40)
+    affected = sim_api.take_affected()
+    assert affected == {"volume"}
+    simulator.requests.clear()
+
+    assert await sim_api.read_keys(affected) == {"volume": 40}
+    assert simulator.requests == [("getData", "player:volume")]
+
+    await sim_api.set_input("bluetooth")
+    await sim_api.set_eq_preset("rock")
+    assert sim_api.take_affected() == {"input", "decoder", "player", "eq_preset", "bass", "mid", "treble"}
+    assert sim_api.take_affected() == set()
@@ -0,0 +1,58 @@
+"""Tests for the Klipsch Flexus status snapshot."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from custom_components.klipsch_flexus.schema import PARAMS
+from custom_components.klipsch_flexus.status import NO_PLAYER, OFFLINE, DeviceStatus
+
+from .conftest import MOCK_STATUS
+
+MOCK_PLAYER = {
+    "state": "playing",
+    "controls": {"pause": True, "next_": True},
+    "trackRoles": {
+        "title": "Song",
+        "icon": "http://art/1.jpg",
+        "mediaData": {"metaData": {"artist": "Artist", "album": "Album", "externalAppName": "Spotify"}},
+    },
+    "mediaRoles": {"title": "Spotify"},
+    "status": {"duration": 215000},
+}
+
+
+def test_fields_cover_schema() -> None:
+    """Test that every schema parameter has a typed field."""
+    fields = {field.name for field in dataclasses.fields(DeviceStatus)}
+    assert set(PARAMS) <= fields
+
+
+def test_from_data() -> None:
+    """Test flags, parameters and pre-resolved player metadata."""
+    status = DeviceStatus.from_data({**MOCK_STATUS, "power": "online", "player": MOCK_PLAYER})
+
+    assert status.available and not status.is_standby
+    assert status.volume == 25
+    assert status.dirac == 1
+    player = status.player
+    assert (player.title, player.artist, player.album) == ("Song", "Artist", "Album")
+    assert player.active and player.can_pause and player.can_next and not player.can_previous
+    assert player.duration == 215
+    assert player.source_app == "Spotify"
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        status.volume = 30
+
+
+def test_standby_offline_and_unread() -> None:
+    """Test the precomputed flags and None for parameters not read yet."""
+    standby = DeviceStatus.from_data({"online": True, "power": "networkStandby", "volume": 25})
+    assert standby.online and standby.is_standby and not standby.available
+    assert standby.bass is None
+    assert standby.player is NO_PLAYER
+
+    assert DeviceStatus.from_data({"online": False}).available is False
+    assert DeviceStatus.from_data(None) is OFFLINE